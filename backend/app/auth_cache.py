@@ -0,0 +1,96 @@
+"""
+Per-worker caches for authenticated requests.
+
+Verified access-token claims are kept until the token expires (capped by a
+TTL) under a hash of the token, and the authenticated user's column values
+are kept as a short-lived snapshot. A commit that updates or deletes a user
+or expert profile drops that user's snapshot, so only out-of-band edits
+(e.g. SQL run against the database directly) wait for the TTL.
+"""
+
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from .cache import MemoryBackend
+from .core.config import get_settings
+from .models import ExpertProfile, User
+from .utils.security import decode_token
+
+settings = get_settings()
+
+claims_cache = MemoryBackend(settings.auth_cache_max_entries)
+user_cache = MemoryBackend(settings.auth_cache_max_entries)
+
+_USER_COLUMNS = [attr.key for attr in User.__mapper__.column_attrs]
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def access_token_claims(token: str) -> Dict[str, Any]:
+    """`decode_token(token, "access")`, skipping signature checks for known tokens."""
+    key = _token_key(token)
+    payload = claims_cache.get(key)
+    if payload is not None:
+        return payload
+    payload = decode_token(token, expected_type="access")
+    ttl = settings.auth_claims_ttl_seconds
+    expires = payload.get("exp")
+    if isinstance(expires, (int, float)):
+        ttl = min(ttl, expires - time.time())
+    if ttl > 0:
+        claims_cache.set(key, payload, ttl)
+    return payload
+
+
+def load_user(db: Session, user_id: str) -> Optional[User]:
+    """
+    Return the user attached to `db`, from the snapshot cache when possible.
+
+    A cached snapshot is merged without a SELECT; relationships such as
+    `expert_profile` still load lazily when a handler touches them.
+    """
+    values = user_cache.get(user_id)
+    if values is not None:
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None and settings.auth_user_ttl_seconds > 0:
+        user_cache.set(
+            user_id,
+            {column: getattr(user, column) for column in _USER_COLUMNS},
+            settings.auth_user_ttl_seconds,
+        )
+    return user
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    stale = session.info.setdefault("stale_user_ids", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            stale.add(obj.id)
+        elif isinstance(obj, ExpertProfile):
+            stale.add(obj.user_id)
+
+
+def _after_commit(session: Session) -> None:
+    for user_id in session.info.pop("stale_user_ids", ()):
+        user_cache.delete(user_id)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop("stale_user_ids", None)
+
+
+def install_user_cache_hooks() -> None:
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
@@ -0,0 +1,301 @@
+"""
+Response cache for public GET endpoints.
+
+Entries are rendered JSON bodies keyed on route + query string and labelled
+with tags (question, user, category, ...). Mutating endpoints invalidate the
+tags they touch after committing, so hot pages are served without the DB.
+
+Every invalidation also bumps a generation counter. A handler reads it
+before querying and hands it to `store`, which drops the entry again if
+an invalidation ran in between: a page read before a write could
+otherwise be cached after that write's invalidation and outlive it.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Mapping, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from .core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+QUESTIONS_TAG = "questions"
+EXPERTS_TAG = "experts"
+
+
+def question_tag(question_id: str) -> str:
+    return f"question:{question_id}"
+
+
+def user_tag(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+def category_tag(category: Optional[str]) -> str:
+    return f"category:{category}"
+
+
+class MemoryBackend:
+    """Thread-safe in-process LRU with per-entry TTL and a tag index."""
+
+    def __init__(self, max_entries: int = 2048) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._invalidated_at = 0.0
+        self._generation = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            self._invalidated_at = time.time()
+            self._generation += 1
+            for tag in tags:
+                for key in self._tags.pop(tag, set()):
+                    self._remove(key)
+
+    def last_invalidated(self) -> float:
+        return self._invalidated_at
+
+    def generation(self) -> int:
+        return self._generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisBackend:
+    """
+    Shared cache over the Redis protocol, so all workers see one invalidation.
+
+    Calls are synchronous; errors are logged and treated as cache misses.
+    """
+
+    def __init__(self, url: str, prefix: str = "skillgig:cache:") -> None:
+        try:
+            import redis
+        except ImportError as exc:  # optional dependency
+            raise RuntimeError("APP_CACHE_BACKEND=redis requires the `redis` package") from exc
+        self._errors = redis.RedisError
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(self.prefix + key)
+        except self._errors:
+            logger.warning("Cache get failed for %s", key, exc_info=True)
+            return None
+
+    def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str] = ()) -> None:
+        seconds = max(1, int(ttl))
+        try:
+            pipe = self.client.pipeline()
+            pipe.set(self.prefix + key, value, ex=seconds)
+            for tag in tags:
+                tag_key = f"{self.prefix}tag:{tag}"
+                pipe.sadd(tag_key, key)
+                pipe.expire(tag_key, seconds)
+            pipe.execute()
+        except self._errors:
+            logger.warning("Cache set failed for %s", key, exc_info=True)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(self.prefix + key)
+        except self._errors:
+            logger.warning("Cache delete failed for %s", key, exc_info=True)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        try:
+            self.client.set(f"{self.prefix}invalidated_at", time.time())
+            self.client.incr(f"{self.prefix}generation")
+            for tag in tags:
+                tag_key = f"{self.prefix}tag:{tag}"
+                keys = [self.prefix + key.decode() for key in self.client.smembers(tag_key)]
+                self.client.delete(*keys, tag_key)
+        except self._errors:
+            logger.warning("Cache invalidation failed for %s", tags, exc_info=True)
+
+    def last_invalidated(self) -> float:
+        try:
+            return float(self.client.get(f"{self.prefix}invalidated_at") or 0)
+        except self._errors:
+            logger.warning("Cache read of invalidated_at failed", exc_info=True)
+            # Unknown: assume a write just happened.
+            return time.time()
+
+    def generation(self) -> Optional[int]:
+        try:
+            return int(self.client.get(f"{self.prefix}generation") or 0)
+        except self._errors:
+            logger.warning("Cache read of generation failed", exc_info=True)
+            # Unknown: never equal to a snapshot, so nothing is kept.
+            return None
+
+    def clear(self) -> None:
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + "*"))
+            if keys:
+                self.client.delete(*keys)
+        except self._errors:
+            logger.warning("Cache clear failed", exc_info=True)
+
+
+class NullBackend:
+    def get(self, key: str) -> None:
+        return None
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        pass
+
+    def last_invalidated(self) -> float:
+        return 0.0
+
+    def generation(self) -> int:
+        return 0
+
+    def clear(self) -> None:
+        pass
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl_seconds: float, replica_lag_seconds: float = 0.0) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        # How far a replica may trail the primary; see `store(replica=...)`.
+        self.replica_lag_seconds = replica_lag_seconds
+
+    @staticmethod
+    def key_for(request: Request, version: str = "") -> str:
+        # `version` (e.g. an ETag) keeps bodies of older row versions from being served.
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}#{version}"
+
+    def generation(self) -> Optional[int]:
+        """Snapshot to pass to `store`; take it before reading the database."""
+        return self.backend.generation()
+
+    def get(
+        self, key: str, headers: Optional[Mapping[str, str]] = None
+    ) -> Optional[Response]:
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        # Entries are `<JSON object of stored headers>\n<body>`; JSON never
+        # contains a raw newline, so the first one ends the header part.
+        head, sep, body = entry.partition(b"\n")
+        if not sep:
+            return None
+        stored = json.loads(head)
+        if headers:
+            stored.update(headers)
+        return Response(content=body, media_type="application/json", headers=stored)
+
+    def store(
+        self,
+        key: str,
+        body: bytes,
+        tags: Iterable[str],
+        headers: Optional[Mapping[str, str]] = None,
+        stored_headers: Optional[Mapping[str, str]] = None,
+        *,
+        generation: Optional[int],
+        replica: bool = False,
+    ) -> Response:
+        """
+        Cache `body` and return it as a response. `stored_headers` belong to
+        the representation (e.g. a next-page cursor) and are replayed on
+        hits; `headers` are only sent with this response.
+
+        A body read from a `replica` within the replica lag of the last
+        invalidation may predate that write; it is returned but not cached,
+        or it would be served to everyone, the writer included.
+
+        Likewise the entry is removed again unless `generation`, taken
+        before the query, is still current (None, from a backend that could
+        not tell, never is). Checking after the write leaves no gap: a later
+        invalidation finds the entry by its tags.
+        """
+        stored = dict(stored_headers or {})
+        if not (replica and self._replica_may_be_stale()):
+            entry = json.dumps(stored).encode() + b"\n" + body
+            self.backend.set(key, entry, self.ttl_seconds, tags)
+            if generation is None or self.backend.generation() != generation:
+                self.backend.delete(key)
+        if headers:
+            stored.update(headers)
+        return Response(content=body, media_type="application/json", headers=stored)
+
+    def invalidate(self, *tags: Optional[str]) -> None:
+        self.backend.invalidate_tags([tag for tag in tags if tag])
+
+    def _replica_may_be_stale(self) -> bool:
+        return time.time() - self.backend.last_invalidated() < self.replica_lag_seconds
+
+
+def _build_backend():
+    name = settings.cache_backend.lower()
+    if name == "memory":
+        return MemoryBackend(settings.cache_max_entries)
+    if name == "redis":
+        return RedisBackend(settings.cache_url)
+    if name == "none":
+        return NullBackend()
+    raise ValueError(f"Unknown cache backend {settings.cache_backend!r}")
+
+
+response_cache = ResponseCache(
+    _build_backend(), settings.cache_ttl_seconds, settings.read_your_writes_seconds
+)
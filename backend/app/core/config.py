@@ -13,6 +13,25 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 60 * 24  # 24 hours
     refresh_token_expire_minutes: int = 60 * 24 * 7  # 7 days
     database_url: str = Field(default="sqlite:///./data/app.db")
+    # Optional read replicas (comma-separated); GET handlers read from these
+    database_replica_urls: Union[List[str], str] = Field(default=[])
+    # After a write, send that client's reads to the primary for this long
+    # (the client echoes the X-Primary-Until header it gets back)
+    read_your_writes_seconds: float = 5.0
+
+    # Connection pool (sizing is ignored for in-memory SQLite)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800  # seconds, -1 disables
+    db_pool_pre_ping: bool | None = None  # None: off for SQLite, on otherwise
+
+    # SQLite pragmas applied to every new connection
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size: int = -64000  # negative values are KiB
+    sqlite_busy_timeout_ms: int = 30000
     
     # CORS origins - ЖАҢАРТЫЛДЫ! 🔥
     cors_origins: Union[List[str], str] = Field(
@@ -31,6 +50,40 @@ class Settings(BaseSettings):
     cors_origin_regex: str | None = Field(default=None)
     environment: str = "development"
 
+    # Response cache for public GET endpoints: "memory", "redis" or "none"
+    # ("memory" is per worker, so writes only invalidate the worker that made them)
+    cache_backend: str = "memory"
+    cache_url: str = "redis://localhost:6379/0"
+    cache_ttl_seconds: float = 30.0
+    cache_max_entries: int = 2048
+
+    # Live question events (SSE/WebSocket): "memory" (per worker) or "redis"
+    events_backend: str = "memory"
+    events_url: str = "redis://localhost:6379/0"
+    events_queue_size: int = 100
+    events_heartbeat_seconds: float = 15.0
+
+    # Password hashing: bcrypt cost (existing hashes are upgraded on login),
+    # worker processes (0 = threads) and how many sign-ins may wait for them
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
+
+    # Per-worker auth caches: verified token claims and authenticated user rows
+    auth_claims_ttl_seconds: float = 300.0
+    auth_user_ttl_seconds: float = 30.0
+    auth_cache_max_entries: int = 10000
+
+    # Rebuild the /stats and /categories counters this often (0 disables)
+    counters_reconcile_seconds: float = 600.0
+
+    # Per-request SQL instrumentation (Server-Timing headers + /metrics)
+    metrics_enabled: bool = True
+    # Bearer token /metrics requires; without one it is only served in development
+    metrics_token: str | None = Field(default=None)
+    # Log requests whose SQL time exceeds this many milliseconds (0 disables)
+    slow_request_db_ms: float = 500.0
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_prefix="APP_",
@@ -45,6 +98,13 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in origins.split(",") if origin.strip()]
         return origins
 
+    @property
+    def database_replica_url_list(self) -> List[str]:
+        urls = self.database_replica_urls
+        if isinstance(urls, str):
+            return [url.strip() for url in urls.split(",") if url.strip()]
+        return urls
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,217 @@
+"""Per-request SQL instrumentation and Prometheus text metrics."""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.statements += 1
+        self.db_seconds += elapsed
+        if elapsed > self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def install_sql_hooks(engine: Engine) -> None:
+    """Time every cursor execution and charge it to the active request, if any."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._skillgig_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _request_stats.get()
+        started = getattr(context, "_skillgig_started", None)
+        if stats is None or started is None:
+            return
+        stats.record(statement, time.perf_counter() - started)
+
+
+@dataclass
+class _RouteMetrics:
+    requests: Dict[str, int] = field(default_factory=dict)
+    duration_sum: float = 0.0
+    duration_buckets: List[int] = field(
+        default_factory=lambda: [0] * (len(DURATION_BUCKETS) + 1)
+    )
+    statements: int = 0
+    db_seconds: float = 0.0
+    max_statements: int = 0
+    slowest_seconds: float = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], _RouteMetrics] = {}
+
+    def observe(
+        self, method: str, route: str, status_code: int, duration: float, stats: RequestStats
+    ) -> None:
+        with self._lock:
+            metrics = self._routes.setdefault((method, route), _RouteMetrics())
+            key = str(status_code)
+            metrics.requests[key] = metrics.requests.get(key, 0) + 1
+            metrics.duration_sum += duration
+            metrics.duration_buckets[bisect_left(DURATION_BUCKETS, duration)] += 1
+            metrics.statements += stats.statements
+            metrics.db_seconds += stats.db_seconds
+            metrics.max_statements = max(metrics.max_statements, stats.statements)
+            metrics.slowest_seconds = max(metrics.slowest_seconds, stats.slowest_seconds)
+
+    def render(self) -> str:
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = [
+                "# HELP skillgig_http_requests_total HTTP requests by route and status.",
+                "# TYPE skillgig_http_requests_total counter",
+            ]
+            for (method, route), metrics in routes:
+                for code, count in sorted(metrics.requests.items()):
+                    lines.append(
+                        f'skillgig_http_requests_total{{method="{method}",route="{route}",'
+                        f'status="{code}"}} {count}'
+                    )
+
+            lines += [
+                "# HELP skillgig_http_request_duration_seconds Request latency by route.",
+                "# TYPE skillgig_http_request_duration_seconds histogram",
+            ]
+            for (method, route), metrics in routes:
+                labels = f'method="{method}",route="{route}"'
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, metrics.duration_buckets):
+                    cumulative += count
+                    lines.append(
+                        f'skillgig_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                        f"{cumulative}"
+                    )
+                total = cumulative + metrics.duration_buckets[-1]
+                lines.append(
+                    f'skillgig_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {total}'
+                )
+                lines.append(
+                    f"skillgig_http_request_duration_seconds_sum{{{labels}}} "
+                    f"{metrics.duration_sum:.6f}"
+                )
+                lines.append(f"skillgig_http_request_duration_seconds_count{{{labels}}} {total}")
+
+            per_route = [
+                ("skillgig_db_statements_total", "counter",
+                 "SQL statements executed.", lambda m: m.statements),
+                ("skillgig_db_duration_seconds_total", "counter",
+                 "Time spent in SQL.", lambda m: f"{m.db_seconds:.6f}"),
+                ("skillgig_db_statements_per_request_max", "gauge",
+                 "Most SQL statements seen in a single request.", lambda m: m.max_statements),
+                ("skillgig_db_slowest_statement_seconds", "gauge",
+                 "Slowest single SQL statement.", lambda m: f"{m.slowest_seconds:.6f}"),
+            ]
+            for name, kind, help_text, value in per_route:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for (method, route), metrics in routes:
+                    lines.append(
+                        f'{name}{{method="{method}",route="{route}"}} {value(metrics)}'
+                    )
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def _route_label(scope) -> str:
+    """Templated path such as `/api/v1/questions/{question_id}` to bound label cardinality."""
+    # Set by the router once a route matched.
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    # A router included with a prefix may report its template without it;
+    # the prefix is the literal part of the path in front of the match.
+    path = scope["path"]
+    regex = getattr(route, "path_regex", None)
+    if regex is not None and not regex.match(path):
+        for cut, char in enumerate(path):
+            if char == "/" and cut and regex.match(path[cut:]):
+                return path[:cut] + template
+    return template
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware adding `Server-Timing` headers and feeding `registry`."""
+
+    def __init__(self, app, slow_request_db_ms: float = 0.0) -> None:
+        self.app = app
+        self.slow_request_db_ms = slow_request_db_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.statements} statements", '
+                    f"db-slowest;dur={stats.slowest_seconds * 1000:.2f}, "
+                    f"app;dur={elapsed_ms:.2f}"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            duration = time.perf_counter() - started
+            route_path = _route_label(scope)
+            registry.observe(scope["method"], route_path, status_code, duration, stats)
+            if self.slow_request_db_ms and stats.db_seconds * 1000 >= self.slow_request_db_ms:
+                logger.warning(
+                    "%s %s spent %.1fms in %d SQL statements (slowest %.1fms): %s",
+                    scope["method"],
+                    route_path,
+                    stats.db_seconds * 1000,
+                    stats.statements,
+                    stats.slowest_seconds * 1000,
+                    stats.slowest_statement,
+                )
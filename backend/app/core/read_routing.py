@@ -0,0 +1,73 @@
+"""
+Read-your-writes stickiness for routing reads between primary and replicas.
+
+The client carries the marker: a successful write answers with
+`X-Primary-Until`, the time its replica lag window ends, and the client
+sends it back on later requests. Any worker can honour it without shared
+state, and one caller's writes never pin anybody else to the primary.
+"""
+
+import math
+import time
+from typing import Optional
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
+_PRIMARY_UNTIL = PRIMARY_UNTIL_HEADER.lower().encode()
+
+
+def primary_until(scope) -> Optional[float]:
+    """The `X-Primary-Until` timestamp the caller sent, if it is a number."""
+    for name, value in scope.get("headers", []):
+        if name == _PRIMARY_UNTIL:
+            try:
+                until = float(value)
+            except ValueError:
+                return None
+            return until if math.isfinite(until) else None
+    return None
+
+
+class PrimaryStickiness:
+    """Issues and checks the markers that send a writer's reads to the primary."""
+
+    def __init__(self, window_seconds: float) -> None:
+        self.window_seconds = window_seconds
+
+    def marker(self) -> Optional[str]:
+        if self.window_seconds <= 0:
+            return None
+        return f"{time.time() + self.window_seconds:.3f}"
+
+    def is_sticky(self, scope) -> bool:
+        until = primary_until(scope)
+        if until is None:
+            return False
+        now = time.time()
+        # Markers reaching further ahead than one window (plus a second of
+        # clock skew between servers) were not issued here.
+        return now < until <= now + self.window_seconds + 1
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware handing callers of successful writes a primary marker."""
+
+    def __init__(self, app, stickiness: PrimaryStickiness) -> None:
+        self.app = app
+        self.stickiness = stickiness
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                marker = self.stickiness.marker()
+                if marker:
+                    headers = list(message.get("headers", []))
+                    headers.append((_PRIMARY_UNTIL, marker.encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
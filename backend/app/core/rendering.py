@@ -0,0 +1,26 @@
+"""JSON responses rendered straight from pydantic models to bytes."""
+
+from typing import Sequence, Union
+
+from fastapi import Response
+from pydantic import BaseModel
+
+
+class SchemaResponse(Response):
+    """
+    Like `JSONResponse`, for a model or a list of models: pydantic-core
+    writes the camelCase JSON directly, without `jsonable_encoder` or a
+    second validation against the route's `response_model`. The content
+    must already be the documented response schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Union[BaseModel, Sequence[BaseModel]]) -> bytes:
+        if isinstance(content, BaseModel):
+            return _dump(content)
+        return b"[" + b",".join(_dump(item) for item in content) + b"]"
+
+
+def _dump(model: BaseModel) -> bytes:
+    return model.model_dump_json(by_alias=True).encode()
@@ -0,0 +1,135 @@
+"""
+Incremental JSON and NDJSON bodies for large list responses.
+
+ORM rows are read `STREAM_BATCH_SIZE` at a time with `yield_per` and
+released after each batch; each row is serialized straight to bytes (no
+response model re-validation) and flushed in ~64 KiB chunks, so memory
+stays bounded by the batch size rather than the result size.
+"""
+
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import Select
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CHUNK_BYTES = 64 * 1024
+STREAM_BATCH_SIZE = 200
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+Models = Union[Iterable[BaseModel], AsyncIterable[BaseModel]]
+
+
+def stream_format(request: Request, stream: bool) -> Optional[str]:
+    """`"ndjson"` if the client accepts NDJSON, `"json"` for `?stream=true`, else None."""
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return "ndjson"
+    return "json" if stream else None
+
+
+def iter_schemas(
+    factory: sessionmaker, query: Select, to_schema: Callable[..., SchemaT]
+) -> Iterator[SchemaT]:
+    # The body is sent after the request's dependencies have closed, so
+    # the iterator owns its session.
+    with factory() as db:
+        result = db.scalars(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+        for batch in result.partitions():
+            for row in batch:
+                yield to_schema(row)
+            db.expunge_all()
+
+
+async def aiter_schemas(
+    factory: async_sessionmaker, query: Select, to_schema: Callable[..., SchemaT]
+) -> AsyncIterator[SchemaT]:
+    async with factory() as db:
+        result = await db.stream_scalars(
+            query.execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        async for batch in result.partitions():
+            for row in batch:
+                yield to_schema(row)
+            db.expunge_all()
+
+
+def _encode(model: BaseModel) -> bytes:
+    return model.model_dump_json(by_alias=True).encode()
+
+
+class _Body:
+    def __init__(self, fmt: str, prefix: bytes, suffix: Callable[[], bytes]) -> None:
+        self.ndjson = fmt == "ndjson"
+        self.prefix = b"" if self.ndjson else prefix
+        self.suffix = suffix
+        self.buffer = bytearray(self.prefix)
+        self.first = True
+
+    def add(self, model: BaseModel) -> Optional[bytes]:
+        if self.ndjson:
+            self.buffer += _encode(model) + b"\n"
+        else:
+            if not self.first:
+                self.buffer += b","
+            self.buffer += _encode(model)
+        self.first = False
+        if len(self.buffer) >= CHUNK_BYTES:
+            chunk = bytes(self.buffer)
+            self.buffer.clear()
+            return chunk
+        return None
+
+    def close(self) -> bytes:
+        if not self.ndjson:
+            self.buffer += self.suffix()
+        return bytes(self.buffer)
+
+
+def _sync_chunks(models: Iterable[BaseModel], body: _Body) -> Iterator[bytes]:
+    for model in models:
+        chunk = body.add(model)
+        if chunk:
+            yield chunk
+    yield body.close()
+
+
+async def _async_chunks(models: AsyncIterable[BaseModel], body: _Body) -> AsyncIterator[bytes]:
+    async for model in models:
+        chunk = body.add(model)
+        if chunk:
+            yield chunk
+    yield body.close()
+
+
+def streaming_list_response(
+    models: Models,
+    fmt: str,
+    prefix: bytes = b"[",
+    suffix: Callable[[], bytes] = lambda: b"]",
+) -> StreamingResponse:
+    """
+    Stream `models` as one JSON document (`prefix`, comma-separated items,
+    `suffix()`) or as NDJSON, one item per line without the envelope.
+    `suffix` is evaluated after the last item, e.g. to append a cursor.
+    """
+    body = _Body(fmt, prefix, suffix)
+    if hasattr(models, "__aiter__"):
+        content = _async_chunks(models, body)
+    else:
+        content = _sync_chunks(models, body)
+    media_type = NDJSON_MEDIA_TYPE if body.ndjson else "application/json"
+    return StreamingResponse(content, media_type=media_type)
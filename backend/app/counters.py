@@ -0,0 +1,266 @@
+"""
+Materialized question/user counts for the home page endpoints.
+
+Counts move incrementally with every ORM flush that creates or deletes a
+question or user, or changes a question's status, category or tags. A
+periodic reconciliation rebuilds them from the source tables to heal any
+drift. Tag usage lives in `tags` (overall) and `category_tags`.
+"""
+
+import asyncio
+import logging
+from collections import Counter as Deltas
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import delete, event, func, inspect, literal, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import CategoryTag, Counter, Question, QuestionTag, Tag, User
+
+logger = logging.getLogger(__name__)
+
+QUESTIONS_TOTAL = "questions:total"
+USERS_TOTAL = "users:total"
+STATUS_PREFIX = "questions:status:"
+CATEGORY_PREFIX = "questions:category:"
+
+
+def status_key(status: Optional[str]) -> str:
+    return f"{STATUS_PREFIX}{status}"
+
+
+def category_key(category: Optional[str]) -> str:
+    return f"{CATEGORY_PREFIX}{category}"
+
+
+def question_deltas(status: Optional[str], category: Optional[str], sign: int) -> Deltas:
+    return Deltas({QUESTIONS_TOTAL: sign, status_key(status): sign, category_key(category): sign})
+
+
+def _changed_value(obj, attr: str):
+    """(old, new) when `attr` was loaded and then changed, otherwise None."""
+    history = inspect(obj).attrs[attr].history
+    if history.added and history.deleted and history.added[0] != history.deleted[0]:
+        return history.deleted[0], history.added[0]
+    return None
+
+
+def _committed_value(obj, attr: str):
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(obj, attr)
+
+
+def _flush_deltas(session: Session) -> Deltas:
+    deltas: Deltas = Deltas()
+    for obj in session.new:
+        if isinstance(obj, Question):
+            # Column defaults are not applied until the INSERT runs.
+            deltas.update(question_deltas(obj.status or "draft", obj.category, 1))
+        elif isinstance(obj, User):
+            deltas[USERS_TOTAL] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Question):
+            deltas.update(
+                question_deltas(
+                    _committed_value(obj, "status"), _committed_value(obj, "category"), -1
+                )
+            )
+        elif isinstance(obj, User):
+            deltas[USERS_TOTAL] -= 1
+    for obj in session.dirty:
+        if not isinstance(obj, Question):
+            continue
+        for attr, key in (("status", status_key), ("category", category_key)):
+            change = _changed_value(obj, attr)
+            if change:
+                deltas[key(change[0])] -= 1
+                deltas[key(change[1])] += 1
+    return deltas
+
+
+def _tag_links(question: Question) -> Tuple[Set[str], Set[str]]:
+    """(committed, pending) tag sets of a question's `tag_links`."""
+    history = inspect(question).attrs["tag_links"].history
+    unchanged = {link.tag for link in history.unchanged}
+    return (
+        unchanged | {link.tag for link in history.deleted},
+        unchanged | {link.tag for link in history.added},
+    )
+
+
+def _flush_tag_deltas(session: Session) -> Deltas:
+    """Per-(category, tag) question count changes for this flush."""
+    deltas: Deltas = Deltas()
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, Question):
+                for tag in _tag_links(obj)[1]:
+                    deltas[(obj.category, tag)] += 1
+        for obj in session.deleted:
+            if isinstance(obj, Question):
+                category = _committed_value(obj, "category")
+                obj.tag_links  # committed links, loaded if needed
+                for tag in _tag_links(obj)[0]:
+                    deltas[(category, tag)] -= 1
+        for obj in session.dirty:
+            if not isinstance(obj, Question):
+                continue
+            category_change = _changed_value(obj, "category")
+            if category_change:
+                obj.tag_links
+            elif not inspect(obj).attrs["tag_links"].history.has_changes():
+                continue
+            old_category, new_category = category_change or (obj.category, obj.category)
+            old_tags, new_tags = _tag_links(obj)
+            for tag in old_tags:
+                deltas[(old_category, tag)] -= 1
+            for tag in new_tags:
+                deltas[(new_category, tag)] += 1
+    return deltas
+
+
+def _increment(
+    conn: Connection, model, count_column: str, items: List[Tuple[dict, int]]
+) -> None:
+    """Add each delta to the row identified by its primary key values, creating it."""
+    count = getattr(model, count_column)
+    dialect = conn.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        for keys, value in items:
+            stmt = insert(model).values(**keys, **{count_column: value})
+            conn.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=list(keys),
+                    set_={count_column: count + stmt.excluded[count_column]},
+                )
+            )
+        return
+    for keys, value in items:
+        conditions = [getattr(model, name) == key for name, key in keys.items()]
+        result = conn.execute(
+            update(model).where(*conditions).values({count_column: count + value})
+        )
+        if result.rowcount == 0:
+            conn.execute(model.__table__.insert().values(**keys, **{count_column: value}))
+
+
+def apply_deltas(conn: Connection, deltas: Mapping[str, int]) -> None:
+    """Add `deltas` to the stored counters, creating missing keys."""
+    items = [({"key": key}, value) for key, value in deltas.items() if value]
+    _increment(conn, Counter, "value", items)
+
+
+def apply_tag_deltas(conn: Connection, deltas: Mapping[Tuple[str, str], int]) -> None:
+    """Add per-(category, tag) deltas to `category_tags` and their sums to `tags`."""
+    totals: Deltas = Deltas()
+    for (_, tag), value in deltas.items():
+        totals[tag] += value
+    _increment(
+        conn,
+        CategoryTag,
+        "questions_count",
+        [({"category": c, "tag": t}, value) for (c, t), value in deltas.items() if value],
+    )
+    _increment(
+        conn,
+        Tag,
+        "questions_count",
+        [({"name": tag}, value) for tag, value in totals.items() if value],
+    )
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:
+    # Computed before the flush, while deleted rows can still be read.
+    session.info["counter_deltas"] = _flush_deltas(session)
+    session.info["tag_deltas"] = _flush_tag_deltas(session)
+
+
+def _after_flush(session: Session, flush_context) -> None:
+    deltas = session.info.pop("counter_deltas", None)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+    tag_deltas = session.info.pop("tag_deltas", None)
+    if tag_deltas:
+        apply_tag_deltas(session.connection(), tag_deltas)
+
+
+def install_counter_hooks() -> None:
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "after_flush", _after_flush)
+
+
+def reconcile_counters(conn: Connection) -> None:
+    """Rebuild every counter from the source tables."""
+    # Delete first so SQLite takes the write lock before the counts are read.
+    conn.execute(delete(Counter))
+    sources = union_all(
+        select(literal(QUESTIONS_TOTAL).label("key"), func.count(Question.id).label("value")),
+        select(literal(USERS_TOTAL), func.count(User.id)),
+        select(STATUS_PREFIX + Question.status, func.count(Question.id)).group_by(
+            Question.status
+        ),
+        select(CATEGORY_PREFIX + Question.category, func.count(Question.id)).group_by(
+            Question.category
+        ),
+    )
+    conn.execute(Counter.__table__.insert().from_select(["key", "value"], sources))
+
+
+def reconcile_tag_counts(conn: Connection) -> None:
+    """Rebuild `tags` and `category_tags` from `question_tags`."""
+    conn.execute(delete(CategoryTag))
+    conn.execute(delete(Tag))
+    conn.execute(
+        CategoryTag.__table__.insert().from_select(
+            ["category", "tag", "questions_count"],
+            select(Question.category, QuestionTag.tag, func.count())
+            .join(Question, Question.id == QuestionTag.question_id)
+            .group_by(Question.category, QuestionTag.tag),
+        )
+    )
+    conn.execute(
+        Tag.__table__.insert().from_select(
+            ["name", "questions_count"],
+            select(QuestionTag.tag, func.count()).group_by(QuestionTag.tag),
+        )
+    )
+
+
+def reconcile_all(engine: Engine) -> None:
+    with engine.begin() as conn:
+        reconcile_counters(conn)
+        reconcile_tag_counts(conn)
+
+
+async def reconcile_periodically(engine: Engine, interval_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(reconcile_all, engine)
+        except Exception:  # keep the loop alive; the next run retries
+            logger.exception("Counter reconciliation failed")
+
+
+async def read_counters(db: AsyncSession, keys: Iterable[str]) -> Dict[str, int]:
+    result = await db.execute(
+        select(Counter.key, Counter.value).where(Counter.key.in_(list(keys)))
+    )
+    return dict(result.all())
+
+
+async def read_prefix(db: AsyncSession, prefix: str) -> Dict[str, int]:
+    result = await db.execute(
+        select(Counter.key, Counter.value).where(
+            Counter.key.startswith(prefix, autoescape=True)
+        )
+    )
+    return {key[len(prefix):]: value for key, value in result.all()}
@@ -1,28 +1,124 @@
+import itertools
 import os
 from pathlib import Path
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from .core.config import get_settings
+from .core.read_routing import PrimaryStickiness
 
 settings = get_settings()
 
 connect_args = {}
 database_url = settings.database_url
+is_sqlite = database_url.startswith("sqlite")
+is_sqlite_memory = is_sqlite and ":memory:" in database_url
 
-if database_url.startswith("sqlite"):
+if is_sqlite and not is_sqlite_memory:
     db_path = database_url.replace("sqlite:///", "", 1)
     db_dir = Path(db_path).parent
     db_dir.mkdir(parents=True, exist_ok=True)
+if is_sqlite:
     # On some filesystems (especially bind mounts on Windows/macOS), SQLite can be flaky.
-    # A small timeout makes it more resilient under concurrent access.
-    connect_args = {"check_same_thread": False, "timeout": 30}
+    # A busy timeout makes it more resilient under concurrent access.
+    connect_args = {
+        "check_same_thread": False,
+        "timeout": settings.sqlite_busy_timeout_ms / 1000,
+    }
 
-engine = create_engine(database_url, connect_args=connect_args, pool_pre_ping=True)
+# Async drivers used by the async engine for each sync backend.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if not driver:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()!r}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def engine_options() -> Dict[str, Any]:
+    pre_ping = settings.db_pool_pre_ping
+    if pre_ping is None:
+        # A local SQLite file never drops connections; network databases can.
+        pre_ping = not is_sqlite
+    options: Dict[str, Any] = {"connect_args": connect_args, "pool_pre_ping": pre_ping}
+    if not is_sqlite_memory:
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return options
+
+
+def install_sqlite_pragmas(target: Engine) -> None:
+    """Tune every new SQLite connection: WAL lets readers run alongside a writer."""
+
+    @event.listens_for(target, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        pragmas = [
+            f"synchronous={settings.sqlite_synchronous}",
+            f"cache_size={settings.sqlite_cache_size}",
+            f"busy_timeout={settings.sqlite_busy_timeout_ms}",
+        ]
+        if not is_sqlite_memory:
+            pragmas += [
+                f"journal_mode={settings.sqlite_journal_mode}",
+                f"mmap_size={settings.sqlite_mmap_size}",
+            ]
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(f"PRAGMA {pragma}")
+        finally:
+            cursor.close()
+
+
+engine = create_engine(database_url, **engine_options())
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# Async engine for the read-heavy handlers; shares the database with `engine`.
+async_engine = create_async_engine(async_database_url(database_url), **engine_options())
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+# Read replicas: reads are spread round-robin, writes always go to `engine`.
+replica_engines = [
+    create_engine(url, **engine_options()) for url in settings.database_replica_url_list
+]
+async_replica_engines = [
+    create_async_engine(async_database_url(url), **engine_options())
+    for url in settings.database_replica_url_list
+]
+ReplicaSessions = [
+    sessionmaker(bind=replica, autoflush=False, autocommit=False)
+    for replica in replica_engines
+]
+AsyncReplicaSessions = [
+    async_sessionmaker(bind=replica, autoflush=False, expire_on_commit=False)
+    for replica in async_replica_engines
+]
+_replica_turn = itertools.count()
+stickiness = PrimaryStickiness(settings.read_your_writes_seconds)
+
+if is_sqlite:
+    for target in [engine, *replica_engines]:
+        install_sqlite_pragmas(target)
+    for target in [async_engine, *async_replica_engines]:
+        install_sqlite_pragmas(target.sync_engine)
+
 Base = declarative_base()
 
 
@@ -33,3 +129,45 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _use_primary(request: Request) -> bool:
+    return not ReplicaSessions or stickiness.is_sticky(request.scope)
+
+
+def read_session_factory(request: Request) -> sessionmaker:
+    """Sessions for reads: a replica unless the caller wrote recently."""
+    if _use_primary(request):
+        return SessionLocal
+    request.state.read_replica = True
+    return ReplicaSessions[next(_replica_turn) % len(ReplicaSessions)]
+
+
+def async_read_session_factory(request: Request) -> async_sessionmaker:
+    if _use_primary(request):
+        return AsyncSessionLocal
+    request.state.read_replica = True
+    return AsyncReplicaSessions[next(_replica_turn) % len(AsyncReplicaSessions)]
+
+
+def served_by_replica(request: Request) -> bool:
+    """Whether this request's reads were routed to a replica."""
+    return getattr(request.state, "read_replica", False)
+
+
+def get_read_db(request: Request) -> Generator:
+    """Session for read-only handlers: a replica unless the caller wrote recently."""
+    db = read_session_factory(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with async_read_session_factory(request)() as db:
+        yield db
@@ -3,10 +3,10 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from sqlalchemy.orm import Session
 
+from .auth_cache import access_token_claims, load_user
 from .core.config import get_settings
 from .database import get_db
 from .models.user import User
-from .utils.security import decode_token
 
 settings = get_settings()
 
@@ -18,7 +18,7 @@ def get_current_user(
     token: str = Depends(oauth2_scheme),
 ) -> User:
     try:
-        payload = decode_token(token, expected_type="access")
+        payload = access_token_claims(token)
         user_id = payload.get("sub")
     except JWTError as exc:
         raise HTTPException(
@@ -31,7 +31,7 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
         )
-    user = db.query(User).filter(User.id == user_id).first()
+    user = load_user(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,195 @@
+"""
+Live question events (new, edited, deleted and verified answers).
+
+Handlers publish after committing; subscribers (SSE and WebSocket
+connections, see `routers/events.py`) get every event of one question.
+Delivery is per worker: the memory backend fans out in-process, the Redis
+backend relays events through a pub/sub channel so subscribers on any
+worker see them. Events are best effort: a subscriber that falls
+`events_queue_size` events behind is disconnected and should refetch.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Mapping, Optional, Set
+
+from pydantic import BaseModel
+
+from .core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+ANSWER_CREATED = "answer.created"
+ANSWER_UPDATED = "answer.updated"
+ANSWER_DELETED = "answer.deleted"
+ANSWER_VERIFIED = "answer.verified"
+
+
+def question_topic(question_id: str) -> str:
+    return f"question:{question_id}"
+
+
+class Subscription:
+    """Events of one topic for one consumer, delivered on its event loop."""
+
+    def __init__(self, topic: str, max_pending: int) -> None:
+        self.topic = topic
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(max_pending + 1)
+        self.max_pending = max_pending
+        self.overflowed = False
+
+    def _put(self, data: bytes) -> None:
+        if self.overflowed:
+            return
+        if self.queue.qsize() >= self.max_pending:
+            # The last slot is reserved for the end-of-stream marker.
+            self.overflowed = True
+            self.queue.put_nowait(None)
+            return
+        self.queue.put_nowait(data)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next event as JSON bytes; None once overflowed. Raises on timeout."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class EventBroker:
+    def __init__(self, backend, max_pending: int) -> None:
+        self.backend = backend
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        backend.bind(self)
+
+    def publish(self, topic: str, event_type: str, payload: Mapping[str, Any]) -> None:
+        """Publish from any thread; never raises into the caller."""
+        data = json.dumps(
+            {"type": event_type, **_jsonable(payload)}, separators=(",", ":")
+        ).encode()
+        try:
+            self.backend.publish(topic, data)
+        except Exception:  # a lost event must not fail the request that caused it
+            logger.warning("Publishing %s to %s failed", event_type, topic, exc_info=True)
+
+    def deliver(self, topic: str, data: bytes) -> None:
+        """Hand `data` to this worker's subscribers of `topic` (thread-safe)."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, data)
+            except RuntimeError:  # loop already closed
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, topic: str) -> AsyncIterator[Subscription]:
+        subscription = Subscription(topic, self.max_pending)
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[topic]
+
+    async def start(self) -> None:
+        await self.backend.start()
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+
+def _jsonable(payload: Mapping[str, Any]) -> Dict[str, Any]:
+    return {
+        key: value.model_dump(mode="json", by_alias=True) if isinstance(value, BaseModel) else value
+        for key, value in payload.items()
+    }
+
+
+class MemoryBackend:
+    """Delivers within this worker only."""
+
+    def bind(self, broker: EventBroker) -> None:
+        self.broker = broker
+
+    def publish(self, topic: str, data: bytes) -> None:
+        self.broker.deliver(topic, data)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class RedisBackend:
+    """
+    Relays events through Redis pub/sub so every worker delivers them.
+
+    Publishing is a synchronous call from the handler's thread; each worker
+    runs one listener task for all topics.
+    """
+
+    def __init__(self, url: str, prefix: str = "skillgig:events:") -> None:
+        try:
+            import redis
+            import redis.asyncio as redis_asyncio
+        except ImportError as exc:  # optional dependency
+            raise RuntimeError("APP_EVENTS_BACKEND=redis requires the `redis` package") from exc
+        self.url = url
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+        self._redis_asyncio = redis_asyncio
+        self._listener: Optional[asyncio.Task] = None
+
+    def bind(self, broker: EventBroker) -> None:
+        self.broker = broker
+
+    def publish(self, topic: str, data: bytes) -> None:
+        self.client.publish(self.prefix + topic, data)
+
+    async def start(self) -> None:
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                client = self._redis_asyncio.Redis.from_url(self.url)
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(self.prefix + "*")
+                    async for message in pubsub.listen():
+                        if message["type"] != "pmessage":
+                            continue
+                        topic = message["channel"].decode()[len(self.prefix):]
+                        self.broker.deliver(topic, message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Event listener lost its Redis connection", exc_info=True)
+                await asyncio.sleep(1.0)
+
+
+def _build_backend():
+    name = settings.events_backend.lower()
+    if name == "memory":
+        return MemoryBackend()
+    if name == "redis":
+        return RedisBackend(settings.events_url)
+    raise ValueError(f"Unknown events backend {settings.events_backend!r}")
+
+
+event_broker = EventBroker(_build_backend(), settings.events_queue_size)
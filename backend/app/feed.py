@@ -0,0 +1,76 @@
+"""
+Keyset pages of the question feed, newest first over (created_at, id).
+
+A filter on several statuses ("published" lists published and resolved
+questions) can't walk one index in feed order, so each status gets its
+own seek on (status, created_at, id) and the seeks are merged with
+UNION ALL: the database reads the two ordered runs side by side and
+stops at the page limit instead of sorting every match. Only the page's
+keys come out of the merge; rows and their joins are loaded for those
+keys alone.
+"""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, tuple_, union_all
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import ColumnElement, Select
+
+from .models import Question, User
+
+VISIBLE_STATUSES = ["published", "resolved"]
+
+
+def status_values(status_filter: Optional[str]) -> Optional[List[str]]:
+    """Statuses a `status_filter` query value selects; None for all of them."""
+    if not status_filter or status_filter.lower() == "all":
+        return None
+    if status_filter.lower() == "published":
+        return VISIBLE_STATUSES
+    return [status_filter]
+
+
+def status_condition(statuses: List[str]) -> ColumnElement:
+    if len(statuses) == 1:
+        return Question.status == statuses[0]
+    return Question.status.in_(statuses)
+
+
+def page_keys(
+    filters: list,
+    statuses: Optional[List[str]],
+    after: Optional[Tuple[datetime, str]] = None,
+):
+    """
+    `(id, created_at)` of the questions matching `filters` and `statuses`,
+    newest first, starting after the `after` keyset position.
+    """
+    if after:
+        # A row-value comparison keeps the seek a range on the index; the
+        # equivalent OR of two terms only narrows it by status.
+        filters = filters + [tuple_(Question.created_at, Question.id) < tuple_(*after)]
+    keys = select(Question.id, Question.created_at)
+    if not statuses or len(statuses) == 1:
+        if statuses:
+            filters = filters + [status_condition(statuses)]
+        return keys.where(*filters).order_by(
+            Question.created_at.desc(), Question.id.desc()
+        )
+
+    merged = union_all(
+        *(keys.where(*filters, Question.status == value) for value in statuses)
+    )
+    columns = merged.selected_columns
+    return merged.order_by(columns.created_at.desc(), columns.id.desc())
+
+
+def page_query(keys, limit: int, offset: int = 0) -> Select:
+    """Questions of one page of `keys`, with client and profile, in feed order."""
+    page = keys.limit(limit).offset(offset).subquery("page")
+    return (
+        select(Question)
+        .join(page, Question.id == page.c.id)
+        .options(joinedload(Question.client).joinedload(User.expert_profile))
+        .order_by(page.c.created_at.desc(), page.c.id.desc())
+    )
@@ -0,0 +1,164 @@
+"""
+Check that the hot queries are served by indexes.
+
+Builds the schema with the startup migrations in a scratch SQLite
+database, runs EXPLAIN QUERY PLAN for the query shapes the API issues on
+every page view, and exits non-zero if any of them falls back to a full
+table scan or sorts its rows in a temporary B-tree (a page that sorts
+every match before its LIMIT costs the same as reading them all). Run
+from `backend/`:
+
+    python -m app.index_audit            # scratch in-memory database
+    python -m app.index_audit sqlite:///./data/app.db
+"""
+
+import sys
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import create_engine, func, select, text, union
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+from .feed import VISIBLE_STATUSES, page_keys, page_query
+from .migrations import run_startup_migrations
+from .models import Answer, ExpertProfile, Question, QuestionTag, User
+
+SOME_TIME = datetime(2024, 1, 1)
+AFTER = (SOME_TIME, "question")
+
+
+def _people():
+    # The client and answer authors embedded in a question's pages.
+    return union(
+        select(Question.client_id).where(Question.id == "question"),
+        select(Answer.author_id).where(Answer.question_id == "question"),
+    )
+
+
+def _feed(*filters, after=None) -> Select:
+    return page_query(page_keys(list(filters), VISIBLE_STATUSES, after), 21)
+
+
+HOT_QUERIES: Dict[str, Callable[[], Select]] = {
+    "list_questions": lambda: _feed(),
+    "list_questions cursor": lambda: _feed(after=AFTER),
+    "list_questions by category": lambda: _feed(Question.category == "DevOps"),
+    "list_questions by category, cursor": lambda: _feed(
+        Question.category == "DevOps", after=AFTER
+    ),
+    "list_questions by tags": lambda: _feed(
+        Question.id.in_(
+            select(QuestionTag.question_id)
+            .where(QuestionTag.tag.in_(["vue", "python"]))
+            .group_by(QuestionTag.question_id)
+            .having(func.count(QuestionTag.tag) == 2)
+        ),
+    ),
+    "list_my_questions": lambda: select(Question)
+    .where(Question.client_id == "user")
+    .order_by(Question.created_at.desc()),
+    "list_my_answers": lambda: select(Answer)
+    .where(Answer.author_id == "user")
+    .order_by(Answer.created_at.desc()),
+    "list_answers": lambda: select(Answer)
+    .where(Answer.question_id == "question")
+    .order_by(Answer.is_accepted.desc(), Answer.created_at, Answer.id)
+    .limit(101),
+    "accepted answers": lambda: select(Answer.id).where(
+        Answer.question_id == "question", Answer.is_accepted.is_(True)
+    ),
+    "question etag": lambda: select(
+        Question.updated_at,
+        Question.answers_count,
+        select(func.max(func.coalesce(Answer.updated_at, Answer.created_at)))
+        .where(Answer.question_id == Question.id)
+        .scalar_subquery(),
+        select(func.max(User.updated_at)).where(User.id.in_(_people())).scalar_subquery(),
+        select(func.max(ExpertProfile.updated_at))
+        .where(ExpertProfile.user_id.in_(_people()))
+        .scalar_subquery(),
+    ).where(Question.id == "question"),
+}
+
+
+# (parent step id, detail) rows of EXPLAIN QUERY PLAN.
+Plan = List[Tuple[int, str]]
+
+
+def _subqueries(plan: Plan) -> List[str]:
+    return [
+        detail.split()[-1]
+        for _, detail in plan
+        if detail.startswith(("MATERIALIZE ", "CO-ROUTINE "))
+    ]
+
+
+def _is_full_scan(detail: str, subqueries: List[str]) -> bool:
+    # "SCAN t USING [COVERING] INDEX" walks an index in order; FTS tables
+    # report "VIRTUAL TABLE"; a subquery's rows are audited where it is
+    # built; none of these reads every row of a plain table.
+    return (
+        detail.startswith(("SCAN ", "SEARCH "))
+        and " USING " not in detail
+        and "VIRTUAL TABLE" not in detail
+        and not detail.startswith("SCAN CONSTANT ROW")
+        and detail.split()[1] not in subqueries
+    )
+
+
+def _is_full_sort(plan: Plan, parent: int, detail: str, subqueries: List[str]) -> bool:
+    # Sorting the rows of a materialized page is bounded by its LIMIT; the
+    # page itself is checked at its own level of the plan.
+    if not (detail.startswith("USE TEMP B-TREE") and "ORDER BY" in detail):
+        return False
+    reads = [
+        step
+        for level, step in plan
+        if level == parent and step.startswith(("SCAN ", "SEARCH "))
+    ]
+    return not reads or reads[0].split()[1] not in subqueries
+
+
+def explain(conn: Connection, query: Select) -> Plan:
+    sql = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    return [(row[1], row[3]) for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def audit(database_url: str = "sqlite://") -> List[str]:
+    """Return a description of every hot query that scans a whole table or sorts every match."""
+    engine = create_engine(database_url)
+    if engine.dialect.name != "sqlite":
+        raise SystemExit("The index audit reads SQLite query plans only")
+    run_startup_migrations(engine)
+
+    failures = []
+    with engine.connect() as conn:
+        for name, build in HOT_QUERIES.items():
+            plan = explain(conn, build())
+            subqueries = _subqueries(plan)
+            problems = [
+                detail
+                for parent, detail in plan
+                if _is_full_scan(detail, subqueries)
+                or _is_full_sort(plan, parent, detail, subqueries)
+            ]
+            print(f"{'FAIL' if problems else 'ok  '} {name}")
+            for _, detail in plan:
+                print(f"       {detail}")
+            if problems:
+                failures.append(f"{name}: {', '.join(problems)}")
+    engine.dispose()
+    return failures
+
+
+def main(argv: List[str]) -> int:
+    failures = audit(argv[0] if argv else "sqlite://")
+    if failures:
+        print("\nFull table scans or sorts in hot queries:", *failures, sep="\n  ")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
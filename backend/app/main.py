@@ -1,9 +1,24 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .auth_cache import install_user_cache_hooks
 from .core.config import get_settings
-from .database import Base, engine
-from .routers import auth, users, questions, categories, stats
+from .core.metrics import MetricsMiddleware, install_sql_hooks
+from .core.read_routing import PRIMARY_UNTIL_HEADER, ReadYourWritesMiddleware
+from .counters import install_counter_hooks, reconcile_periodically
+from .database import (
+    async_engine,
+    async_replica_engines,
+    engine,
+    replica_engines,
+    stickiness,
+)
+from .events import event_broker
+from .migrations import run_startup_migrations
+from .routers import auth, users, questions, categories, stats, metrics, tags, events
+from .utils.passwords import password_hasher
 
 
 settings = get_settings()
@@ -25,13 +40,47 @@ app.add_middleware(
     allow_credentials=allow_credentials,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paged answer lists carry their next cursor in a header, and writes
+    # return the marker that keeps the client's reads on the primary.
+    expose_headers=["X-Next-Cursor", "ETag", PRIMARY_UNTIL_HEADER],
 )
 
+if replica_engines:
+    app.add_middleware(ReadYourWritesMiddleware, stickiness=stickiness)
+
+if settings.metrics_enabled:
+    for target in [engine, *replica_engines]:
+        install_sql_hooks(target)
+    for target in [async_engine, *async_replica_engines]:
+        install_sql_hooks(target.sync_engine)
+    app.add_middleware(MetricsMiddleware, slow_request_db_ms=settings.slow_request_db_ms)
+
+
+install_counter_hooks()
+install_user_cache_hooks()
+background_tasks = set()
+
 
 @app.on_event("startup")
-def on_startup() -> None:
-    # Ensure tables exist (for SQLite/local dev)
-    Base.metadata.create_all(bind=engine)
+async def on_startup() -> None:
+    # Creates the schema on first boot; a single version check afterwards.
+    run_startup_migrations(engine)
+    await event_broker.start()
+    if settings.counters_reconcile_seconds > 0:
+        task = asyncio.create_task(
+            reconcile_periodically(engine, settings.counters_reconcile_seconds)
+        )
+        background_tasks.add(task)
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    for task in background_tasks:
+        task.cancel()
+    await event_broker.stop()
+    password_hasher.shutdown()
+    for target in [async_engine, *async_replica_engines]:
+        await target.dispose()
 
 
 # Routers
@@ -40,6 +89,10 @@ app.include_router(users.router, prefix=settings.api_prefix)
 app.include_router(questions.router, prefix=settings.api_prefix)
 app.include_router(categories.router, prefix=settings.api_prefix)
 app.include_router(stats.router, prefix=settings.api_prefix)
+app.include_router(tags.router, prefix=settings.api_prefix)
+app.include_router(events.router, prefix=settings.api_prefix)
+if settings.metrics_enabled:
+    app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -1,31 +1,228 @@
+"""
+Versioned schema migrations.
+
+Each step runs once, in order, in its own transaction and is recorded in
+`schema_migrations`. Steps are written to be idempotent so databases that
+predate versioning (schema built by `create_all()` plus the old ad-hoc
+checks) can replay them safely. Once a database is current, startup costs
+one `SELECT max(version)`.
+
+Concurrent workers serialize on a lock taken at the start of each step
+transaction (an advisory lock on Postgres, `BEGIN IMMEDIATE` on SQLite)
+and re-check the version under it. That way each step is applied exactly
+once.
+"""
+
 from __future__ import annotations
 
-from sqlalchemy import text
-from sqlalchemy.engine import Engine
+import logging
+from datetime import datetime
+from typing import Callable, Iterator, List, Tuple
 
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    exists,
+    func,
+    inspect,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
 
-def _sqlite_has_column(conn, table: str, column: str) -> bool:
-    rows = conn.execute(text(f"PRAGMA table_info({table})")).fetchall()
-    # sqlite PRAGMA table_info columns: cid, name, type, notnull, dflt_value, pk
-    return any(row[1] == column for row in rows)
+from .counters import reconcile_counters, reconcile_tag_counts
+from .database import Base
+from .models import Answer, Question, QuestionTag, User
+from .search import install_search_index
 
+logger = logging.getLogger(__name__)
 
-def run_startup_migrations(engine: Engine) -> None:
-    """
-    Lightweight, idempotent migrations for local SQLite setups.
+BATCH_SIZE = 1000
+# Arbitrary constant identifying the migration lock on Postgres.
+ADVISORY_LOCK_ID = 72_917_001
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(col["name"] == column for col in inspect(conn).get_columns(table))
+
+
+def _add_column(conn: Connection, table: str, column: str, ddl: str) -> bool:
+    """`ALTER TABLE ... ADD COLUMN` unless present; True when it was added."""
+    if _has_column(conn, table, column):
+        return False
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return True
+
+
+def _batched_ids(conn: Connection, id_column, where=None) -> Iterator[List[str]]:
+    """Primary keys in keyset-ordered batches, so backfills never load a whole table."""
+    last = None
+    while True:
+        query = select(id_column).order_by(id_column).limit(BATCH_SIZE)
+        if where is not None:
+            query = query.where(where)
+        if last is not None:
+            query = query.where(id_column > last)
+        ids = list(conn.scalars(query))
+        if not ids:
+            return
+        yield ids
+        last = ids[-1]
+
+
+# Steps -----------------------------------------------------------------
+
+
+def _create_schema(conn: Connection) -> None:
+    # Creates missing tables only; columns added later get their own steps.
+    Base.metadata.create_all(bind=conn)
+
+
+def _add_code_example_columns(conn: Connection) -> None:
+    _add_column(conn, "questions", "code_example", "TEXT")
+    _add_column(conn, "answers", "code_example", "TEXT")
+
+
+def _answers_count_step(model, fk_column) -> Callable[[Connection], None]:
+    def step(conn: Connection) -> None:
+        table = model.__tablename__
+        if not _add_column(conn, table, "answers_count", "INTEGER NOT NULL DEFAULT 0"):
+            return
+        count = (
+            select(func.count(Answer.id))
+            .where(fk_column == model.id)
+            .scalar_subquery()
+        )
+        for ids in _batched_ids(conn, model.id):
+            conn.execute(
+                update(model).where(model.id.in_(ids)).values(answers_count=count)
+            )
+
+    return step
 
-    Note: SQLAlchemy `create_all()` won't add new columns to existing tables.
+
+def _backfill_question_tags(conn: Connection) -> None:
+    """Populate `question_tags` from the JSON `questions.tags` column."""
+    untagged = ~exists().where(QuestionTag.question_id == Question.id)
+    for ids in _batched_ids(conn, Question.id, untagged):
+        rows = []
+        for question_id, tags in conn.execute(
+            select(Question.id, Question.tags).where(Question.id.in_(ids))
+        ):
+            seen = set()
+            for value in tags or []:
+                tag = (value or "").strip().lower()[:100]
+                if tag and tag not in seen:
+                    seen.add(tag)
+                    rows.append({"question_id": question_id, "tag": tag})
+        if rows:
+            conn.execute(insert(QuestionTag), rows)
+
+
+def _add_answer_updated_at(conn: Connection) -> None:
+    # Edit timestamp feeds the question ETag (NULL means never edited).
+    _add_column(conn, "answers", "updated_at", "TIMESTAMP")
+
+
+def _add_profile_updated_at(conn: Connection) -> None:
+    # Profile version for the question ETag (NULL means not edited since).
+    _add_column(conn, "expert_profiles", "updated_at", "TIMESTAMP")
+
+
+def _answers_is_accepted_not_null(conn: Connection) -> None:
+    """
+    The answer page sorts `is_accepted DESC` and its cursor treats NULL as
+    not accepted; Postgres sorts NULL first, so there must be none.
     """
-    if engine.dialect.name != "sqlite":
-        return
+    for ids in _batched_ids(conn, Answer.id, Answer.is_accepted.is_(None)):
+        conn.execute(update(Answer).where(Answer.id.in_(ids)).values(is_accepted=False))
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("ALTER TABLE answers ALTER COLUMN is_accepted SET DEFAULT false"))
+        conn.execute(text("ALTER TABLE answers ALTER COLUMN is_accepted SET NOT NULL"))
+
+
+def _ensure_indexes(conn: Connection) -> None:
+    """Create model indexes that `create_all()` skips on pre-existing tables."""
+    for table in Base.metadata.tables.values():
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
 
-    with engine.begin() as conn:
-        # Questions: support separate code example field.
-        if not _sqlite_has_column(conn, "questions", "code_example"):
-            conn.execute(text("ALTER TABLE questions ADD COLUMN code_example TEXT"))
 
-        # Answers already have this in most DBs, but keep it safe/idempotent.
-        if not _sqlite_has_column(conn, "answers", "code_example"):
-            conn.execute(text("ALTER TABLE answers ADD COLUMN code_example TEXT"))
+def _answer_page_index(conn: Connection) -> None:
+    # Superseded by (question_id, is_accepted, created_at, id).
+    conn.execute(text("DROP INDEX IF EXISTS ix_answers_question_id_is_accepted"))
+    _ensure_indexes(conn)
 
 
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "create schema", _create_schema),
+    (2, "code_example columns", _add_code_example_columns),
+    (3, "questions.answers_count", _answers_count_step(Question, Answer.question_id)),
+    (4, "users.answers_count", _answers_count_step(User, Answer.author_id)),
+    (5, "backfill question_tags", _backfill_question_tags),
+    (6, "seed counters", reconcile_counters),
+    (7, "answers.updated_at", _add_answer_updated_at),
+    (8, "full-text search index", install_search_index),
+    (9, "seed tag counts", reconcile_tag_counts),
+    (10, "composite indexes", _ensure_indexes),
+    (11, "answer page index", _answer_page_index),
+    (12, "expert_profiles.updated_at", _add_profile_updated_at),
+    (13, "answers.is_accepted not null", _answers_is_accepted_not_null),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# Runner ----------------------------------------------------------------
+
+
+def current_version(conn: Connection) -> int:
+    try:
+        return conn.scalar(select(func.max(schema_migrations.c.version))) or 0
+    except (OperationalError, ProgrammingError):  # table not created yet
+        conn.rollback()
+        return 0
+
+
+def _lock(conn: Connection) -> None:
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": ADVISORY_LOCK_ID})
+    elif conn.dialect.name == "sqlite":
+        # Take the write lock up front; pysqlite would otherwise run DDL
+        # outside any transaction.
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def run_startup_migrations(engine: Engine) -> None:
+    """Apply pending migrations; a no-op single query when already current."""
+    with engine.connect() as conn:
+        if current_version(conn) >= LATEST_VERSION:
+            return
+
+    for version, name, step in MIGRATIONS:
+        with engine.begin() as conn:
+            _lock(conn)
+            schema_migrations.create(conn, checkfirst=True)
+            if current_version(conn) >= version:
+                continue
+            logger.info("Applying migration %s: %s", version, name)
+            step(conn)
+            conn.execute(
+                insert(schema_migrations).values(
+                    version=version, name=name, applied_at=datetime.utcnow()
+                )
+            )
@@ -1,5 +1,15 @@
 from .user import ExpertProfile, User
-from .question import Answer, Question
-
-__all__ = ["User", "ExpertProfile", "Question", "Answer"]
+from .question import Answer, Question, QuestionTag
+from .counter import Counter
+from .tag import CategoryTag, Tag
 
+__all__ = [
+    "User",
+    "ExpertProfile",
+    "Question",
+    "QuestionTag",
+    "Answer",
+    "Counter",
+    "Tag",
+    "CategoryTag",
+]
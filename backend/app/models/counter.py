@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+
+from ..database import Base
+
+
+class Counter(Base):
+    """Precomputed aggregate, e.g. `questions:total` or `questions:category:<name>`."""
+
+    __tablename__ = "counters"
+
+    key = Column(String(255), primary_key=True)
+    value = Column(Integer, default=0, nullable=False)
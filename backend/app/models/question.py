@@ -1,7 +1,19 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, String, Text, JSON
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    JSON,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from ..database import Base
@@ -9,6 +21,19 @@ from ..database import Base
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        # Feed: status filter, newest first, id as the keyset tiebreaker.
+        Index("ix_questions_status_created_at_id", "status", "created_at", "id"),
+        Index(
+            "ix_questions_category_status_created_at_id",
+            "category",
+            "status",
+            "created_at",
+            "id",
+        ),
+        # "My questions", newest first.
+        Index("ix_questions_client_id_created_at", "client_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String(255), nullable=False)
@@ -23,6 +48,8 @@ class Question(Base):
     status = Column(String(50), default="draft", nullable=False)
     client_id = Column(String, ForeignKey("users.id"), nullable=False)
     accepted_answer_id = Column(String, ForeignKey("answers.id"), nullable=True)
+    # Maintained by the answer endpoints so list/detail views never load answers.
+    answers_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True
@@ -35,10 +62,41 @@ class Question(Base):
         cascade="all, delete-orphan",
         foreign_keys="Answer.question_id",
     )
+    tag_links = relationship(
+        "QuestionTag",
+        back_populates="question",
+        cascade="all, delete-orphan",
+    )
+
+
+class QuestionTag(Base):
+    """Normalized (lowercased) copy of `Question.tags` used for SQL-side filtering."""
+
+    __tablename__ = "question_tags"
+    __table_args__ = (Index("ix_question_tags_tag_question_id", "tag", "question_id"),)
+
+    question_id = Column(String, ForeignKey("questions.id"), primary_key=True)
+    tag = Column(String(100), primary_key=True)
+
+    question = relationship("Question", back_populates="tag_links")
 
 
 class Answer(Base):
     __tablename__ = "answers"
+    __table_args__ = (
+        # Answers of a question by age, and in display order (accepted
+        # first); the latter also finds a question's accepted answers.
+        Index("ix_answers_question_id_created_at", "question_id", "created_at"),
+        Index(
+            "ix_answers_question_id_is_accepted_created_at",
+            "question_id",
+            text("is_accepted DESC"),
+            "created_at",
+            "id",
+        ),
+        # "My answers", newest first.
+        Index("ix_answers_author_id_created_at", "author_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     question_id = Column(String, ForeignKey("questions.id"), nullable=False)
@@ -48,8 +106,11 @@ class Answer(Base):
     links = Column(JSON, default=list)
     expert_name = Column(String(255), nullable=True)
     expert_rating = Column(Float, nullable=True)
-    is_accepted = Column(Boolean, default=False)
+    is_accepted = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True
+    )
 
     question = relationship(
         "Question",
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Index, Integer, String
+
+from ..database import Base
+
+
+class Tag(Base):
+    """Normalized tag with the number of questions using it."""
+
+    __tablename__ = "tags"
+    __table_args__ = (Index("ix_tags_questions_count", "questions_count"),)
+
+    name = Column(String(100), primary_key=True)
+    questions_count = Column(Integer, default=0, nullable=False)
+
+
+class CategoryTag(Base):
+    """Per-category tag usage, for the most popular tags of each category."""
+
+    __tablename__ = "category_tags"
+    __table_args__ = (
+        Index("ix_category_tags_category_questions_count", "category", "questions_count"),
+    )
+
+    category = Column(String(100), primary_key=True)
+    tag = Column(String(100), primary_key=True)
+    questions_count = Column(Integer, default=0, nullable=False)
@@ -20,6 +20,8 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Maintained by the answer endpoints so serializing a user never loads answers.
+    answers_count = Column(Integer, default=0, server_default="0", nullable=False)
 
     expert_profile = relationship(
         "ExpertProfile",
@@ -30,12 +32,6 @@ class User(Base):
     questions = relationship("Question", back_populates="client", cascade="all, delete")
     answers = relationship("Answer", back_populates="author", cascade="all, delete")
 
-    @property
-    def answers_count(self) -> int:
-        if self.answers is None:
-            return 0
-        return len(self.answers)
-
 
 class ExpertProfile(Base):
     __tablename__ = "expert_profiles"
@@ -52,6 +48,8 @@ class ExpertProfile(Base):
     experience_years = Column(Integer, default=0)
     average_rating = Column(Integer, default=0)
     resolved_questions = Column(Integer, default=0)
+    # Feeds the ETags of pages that embed the profile.
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     user = relationship("User", back_populates="expert_profile")
 
@@ -1,36 +1,38 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import JWTError
-from sqlalchemy import or_
-from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
+from ..cache import EXPERTS_TAG, response_cache
 from ..core.config import get_settings
-from ..database import get_db
+from ..database import get_async_db, get_db
 from ..models import ExpertProfile, User
 from ..schemas.auth import RegisterResponse, RefreshRequest, TokenResponse
 from ..schemas.user import UserCreate, UserPublic
+from ..utils.passwords import password_hasher
 from ..utils.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    get_password_hash,
-    verify_password,
 )
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 settings = get_settings()
 
 
-def _get_user_by_identifier(db: Session, identifier: str) -> User | None:
-    return (
-        db.query(User)
-        .filter(
+async def _get_user_by_identifier(db: AsyncSession, identifier: str) -> User | None:
+    return await db.scalar(
+        select(User)
+        .options(joinedload(User.expert_profile))
+        .where(
             or_(
                 User.email == identifier.lower(),
                 User.username == identifier,
             )
         )
-        .first()
+        .limit(1)
     )
 
 
@@ -39,16 +41,18 @@ def _get_user_by_identifier(db: Session, identifier: str) -> User | None:
     response_model=RegisterResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def register_user(payload: UserCreate, db: Session = Depends(get_db)) -> RegisterResponse:
-    existing_user = (
-        db.query(User)
-        .filter(
+async def register_user(
+    payload: UserCreate, db: AsyncSession = Depends(get_async_db)
+) -> RegisterResponse:
+    existing_user = await db.scalar(
+        select(User.id)
+        .where(
             or_(
                 User.email == payload.email.lower(),
                 User.username == payload.username,
             )
         )
-        .first()
+        .limit(1)
     )
     if existing_user:
         raise HTTPException(
@@ -62,7 +66,7 @@ def register_user(payload: UserCreate, db: Session = Depends(get_db)) -> Registe
         first_name=payload.first_name,
         last_name=payload.last_name,
         role=payload.role or "client",
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=await password_hasher.hash(payload.password),
     )
 
     full_name_parts = [payload.first_name or "", payload.last_name or ""]
@@ -78,20 +82,27 @@ def register_user(payload: UserCreate, db: Session = Depends(get_db)) -> Registe
         db.add(profile)
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user, ["expert_profile"])
+    if user.role == "expert":
+        response_cache.invalidate(EXPERTS_TAG)
     return RegisterResponse(user=UserPublic.model_validate(user, from_attributes=True))
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> TokenResponse:
     identifier = form_data.username
-    user = _get_user_by_identifier(db, identifier)
+    user = await _get_user_by_identifier(db, identifier)
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    is_valid, new_hash = False, None
+    if user:
+        is_valid, new_hash = await password_hasher.verify_and_update(
+            form_data.password, user.hashed_password
+        )
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect username or password",
@@ -103,6 +114,11 @@ def login(
             detail="Inactive user",
         )
 
+    if new_hash:
+        # Stored hash predates the current bcrypt cost; upgrade it transparently.
+        user.hashed_password = new_hash
+        await db.commit()
+
     access_token = create_access_token(user.id)
     refresh_token = create_refresh_token(user.id)
 
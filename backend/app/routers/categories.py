@@ -1,11 +1,11 @@
 from typing import List
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
-from ..models import Question
+from .. import counters
+from ..core.rendering import SchemaResponse
+from ..database import get_async_read_db
 from ..schemas.category import Category
 
 router = APIRouter(prefix="/categories", tags=["categories"])
@@ -23,12 +23,10 @@ CATEGORY_SEED = [
 
 
 @router.get("", response_model=List[Category])
-def list_categories(db: Session = Depends(get_db)) -> List[Category]:
-    totals = dict(
-        db.query(Question.category, func.count(Question.id))
-        .group_by(Question.category)
-        .all()
-    )
+async def list_categories(
+    db: AsyncSession = Depends(get_async_read_db),
+) -> SchemaResponse:
+    totals = await counters.read_prefix(db, counters.CATEGORY_PREFIX)
 
     categories: List[Category] = []
     for item in CATEGORY_SEED:
@@ -41,5 +39,5 @@ def list_categories(db: Session = Depends(get_db)) -> List[Category]:
                 total_questions=totals.get(item["name"], 0),
             )
         )
-    return categories
+    return SchemaResponse(categories)
 
@@ -0,0 +1,85 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from ..core.config import get_settings
+from ..database import async_read_session_factory
+from ..events import event_broker, question_topic
+from ..models import Question
+
+router = APIRouter(prefix="/questions", tags=["events"])
+settings = get_settings()
+
+
+async def _question_exists(factory, question_id: str) -> bool:
+    # A short-lived session: subscriptions outlive any request dependency.
+    async with factory() as db:
+        return await db.scalar(select(Question.id).where(Question.id == question_id)) is not None
+
+
+@router.get("/{question_id}/events")
+async def question_events(question_id: str, request: Request) -> StreamingResponse:
+    """
+    Server-sent events for one question: `answer.created`, `answer.updated`,
+    `answer.deleted` and `answer.verified`, with JSON data. The stream ends
+    when the client falls too far behind; reconnect and refetch then.
+    """
+    if not await _question_exists(async_read_session_factory(request), question_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found")
+
+    async def stream():
+        async with event_broker.subscribe(question_topic(question_id)) as subscription:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    data = await subscription.get(settings.events_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if data is None:
+                    return
+                yield b"data: " + data + b"\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{question_id}/ws")
+async def question_events_ws(websocket: WebSocket, question_id: str) -> None:
+    """The same events as `/events`, one JSON text message each."""
+    await websocket.accept()
+    if not await _question_exists(async_read_session_factory(websocket), question_id):
+        await websocket.close(code=4404, reason="Question not found")
+        return
+
+    async def drain() -> None:
+        # Incoming messages are ignored; this only notices the disconnect.
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+
+    async with event_broker.subscribe(question_topic(question_id)) as subscription:
+        closed = asyncio.create_task(drain())
+        try:
+            while True:
+                received = asyncio.create_task(subscription.get())
+                done, _ = await asyncio.wait(
+                    {received, closed}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if closed in done:
+                    received.cancel()
+                    return
+                data = received.result()
+                if data is None:
+                    await websocket.close(code=4408, reason="Too far behind; refetch")
+                    return
+                await websocket.send_text(data.decode())
+        finally:
+            closed.cancel()
@@ -0,0 +1,36 @@
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from ..core.config import get_settings
+from ..core.metrics import registry
+
+router = APIRouter(tags=["metrics"])
+settings = get_settings()
+
+
+def require_metrics_access(authorization: Optional[str] = Header(None)) -> None:
+    """`Bearer <APP_METRICS_TOKEN>`; without a configured token, development only."""
+    if not settings.metrics_token:
+        if settings.environment.lower() != "development":
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+        return
+    expected = f"Bearer {settings.metrics_token}"
+    if not secrets.compare_digest((authorization or "").encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    dependencies=[Depends(require_metrics_access)],
+)
+def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
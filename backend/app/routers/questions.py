@@ -1,11 +1,51 @@
-from typing import List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import base64
+import binascii
+import json
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import and_, case, func, insert, or_, select, union, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-
-from ..database import get_db
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..cache import (
+    EXPERTS_TAG,
+    QUESTIONS_TAG,
+    category_tag,
+    question_tag,
+    response_cache,
+    user_tag,
+)
+from ..core.conditional import etag_matches, not_modified, weak_etag
+from ..core.rendering import SchemaResponse
+from ..core.streaming import aiter_schemas, stream_format, streaming_list_response
+from ..counters import apply_deltas, apply_tag_deltas, question_deltas
+from ..database import (
+    SessionLocal,
+    async_read_session_factory,
+    get_async_read_db,
+    get_db,
+    served_by_replica,
+)
+from ..events import (
+    ANSWER_CREATED,
+    ANSWER_DELETED,
+    ANSWER_UPDATED,
+    ANSWER_VERIFIED,
+    event_broker,
+    question_topic,
+)
 from ..deps import get_current_active_user
-from ..models import Answer, Question, User, ExpertProfile
+from ..feed import page_keys, page_query, status_condition, status_values
+from ..models import Answer, Question, QuestionTag, User, ExpertProfile
 from ..schemas.answer import (
     AnswerCreate,
     AnswerModerationRequest,
@@ -13,15 +53,32 @@ from ..schemas.answer import (
     AnswerUpdate,
 )
 from ..schemas.question import (
+    BulkImportResponse,
+    BulkRowError,
     QuestionCreate,
+    QuestionExport,
+    QuestionImport,
     QuestionListResponse,
     QuestionOut,
+    QuestionSearchHit,
+    QuestionSearchResponse,
     QuestionUpdate,
 )
 from ..schemas.user import ExpertProfilePublic
+from ..search import is_supported, render_highlight, search_select, search_terms
 
 router = APIRouter(prefix="/questions", tags=["questions"])
 
+BULK_MAX_ROWS = 1000
+IMPORT_CHUNK_SIZE = 500
+# Longest NDJSON line /import buffers while waiting for its newline.
+IMPORT_MAX_LINE_BYTES = 1024 * 1024
+EXPORT_BATCH_SIZE = 200
+ANSWERS_PAGE_SIZE = 100
+ANSWERS_MAX_PAGE_SIZE = 500
+
+_answer_list_adapter = TypeAdapter(List[AnswerOut])
+
 
 def _clean_list(values: Optional[List[str]]) -> List[str]:
     if not values:
@@ -34,6 +91,133 @@ def _clean_list(values: Optional[List[str]]) -> List[str]:
     return cleaned
 
 
+def _normalize_tags(values: Optional[List[str]]) -> List[str]:
+    normalized: List[str] = []
+    for value in values or []:
+        tag = (value or "").strip().lower()[:100]
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized
+
+
+def _sync_question_tags(question: Question) -> None:
+    existing = {link.tag: link for link in question.tag_links}
+    question.tag_links = [
+        existing.get(tag) or QuestionTag(tag=tag)
+        for tag in _normalize_tags(question.tags)
+    ]
+
+
+def _question_filters(
+    category: Optional[str],
+    difficulty: Optional[str],
+    status_filter: Optional[str],
+    tags: Optional[List[str]],
+) -> list:
+    filters = []
+    if category:
+        filters.append(Question.category == category)
+    if difficulty:
+        filters.append(Question.difficulty == difficulty)
+    statuses = status_values(status_filter)
+    if statuses:
+        filters.append(status_condition(statuses))
+
+    normalized_tags = _normalize_tags(tags)
+    if normalized_tags:
+        # Questions whose tag set contains every requested tag.
+        matching_ids = (
+            select(QuestionTag.question_id)
+            .where(QuestionTag.tag.in_(normalized_tags))
+            .group_by(QuestionTag.question_id)
+            .having(func.count(QuestionTag.tag) == len(normalized_tags))
+        )
+        filters.append(Question.id.in_(matching_ids))
+    return filters
+
+
+def _question_cache_tags(question: Question) -> List[str]:
+    # Read before commit: deleted/expired instances can't be refreshed afterwards.
+    return [QUESTIONS_TAG, question_tag(question.id), category_tag(question.category)]
+
+
+async def _question_etag(db: AsyncSession, question_id: str) -> str:
+    """
+    Weak ETag from version columns, in one statement of indexed lookups:
+    the question, its latest answer change, and the users and profiles
+    embedded in the question and its answers (the client and authors).
+    """
+    last_answer_change = (
+        select(func.max(func.coalesce(Answer.updated_at, Answer.created_at)))
+        .where(Answer.question_id == Question.id)
+        .scalar_subquery()
+    )
+    people = union(
+        select(Question.client_id).where(Question.id == question_id),
+        select(Answer.author_id).where(Answer.question_id == question_id),
+    )
+    last_user_change = (
+        select(func.max(User.updated_at)).where(User.id.in_(people)).scalar_subquery()
+    )
+    last_profile_change = (
+        select(func.max(ExpertProfile.updated_at))
+        .where(ExpertProfile.user_id.in_(people))
+        .scalar_subquery()
+    )
+    row = (
+        await db.execute(
+            select(
+                Question.updated_at,
+                Question.answers_count,
+                last_answer_change,
+                last_user_change,
+                last_profile_change,
+            ).where(Question.id == question_id)
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found")
+    return weak_etag(question_id, *row)
+
+
+def _pack_cursor(position: str, question_id: str) -> str:
+    raw = f"{position}|{question_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _unpack_cursor(cursor: str, parse_position):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        position, question_id = raw.split("|", 1)
+        return parse_position(position), question_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from exc
+
+
+def _encode_cursor(question: Question) -> str:
+    return _pack_cursor(question.created_at.isoformat(), question.id)
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    return _unpack_cursor(cursor, datetime.fromisoformat)
+
+
+def _encode_answer_cursor(answer: Answer) -> str:
+    position = f"{int(bool(answer.is_accepted))}:{answer.created_at.isoformat()}"
+    return _pack_cursor(position, answer.id)
+
+
+def _decode_answer_cursor(cursor: str) -> Tuple[Tuple[bool, datetime], str]:
+    def parse(position: str) -> Tuple[bool, datetime]:
+        is_accepted, created_at = position.split(":", 1)
+        return is_accepted == "1", datetime.fromisoformat(created_at)
+
+    return _unpack_cursor(cursor, parse)
+
+
 def _client_name(user: Optional[User]) -> str:
     if not user:
         return "Аноним"
@@ -44,17 +228,55 @@ def _client_name(user: Optional[User]) -> str:
     return user.username or user.email or "Аноним"
 
 
-def _profile_to_schema(profile) -> Optional[ExpertProfilePublic]:
+def profile_to_schema(profile: Optional[ExpertProfile]) -> Optional[ExpertProfilePublic]:
+    # Keyword construction validates in pydantic-core; `from_attributes`
+    # costs several times more per row.
     if not profile:
         return None
-    return ExpertProfilePublic.model_validate(profile, from_attributes=True)
+    return ExpertProfilePublic(
+        full_name=profile.full_name,
+        bio=profile.bio,
+        primary_role=profile.primary_role,
+        skills=profile.skills or [],
+        github_url=profile.github_url,
+        linkedin_url=profile.linkedin_url,
+        portfolio_url=profile.portfolio_url,
+        experience_years=profile.experience_years or 0,
+        average_rating=profile.average_rating or 0,
+        resolved_questions=profile.resolved_questions or 0,
+    )
 
 
-def _adjust_resolved_questions(user: Optional[User], delta: int) -> None:
+def _adjust_resolved_questions(db: Session, user: Optional[User], delta: int) -> None:
+    """
+    Move the author's resolved count by `delta` (never below zero) in one
+    `UPDATE ... RETURNING`, so concurrent moderation can't lose updates.
+    """
     if not user or not user.expert_profile or delta == 0:
         return
-    current = user.expert_profile.resolved_questions or 0
-    user.expert_profile.resolved_questions = max(0, current + delta)
+    profile = user.expert_profile
+    value = func.coalesce(ExpertProfile.resolved_questions, 0) + delta
+    resolved = db.execute(
+        update(ExpertProfile)
+        .where(ExpertProfile.id == profile.id)
+        .values(resolved_questions=case((value < 0, 0), else_=value))
+        .returning(ExpertProfile.resolved_questions)
+        .execution_options(synchronize_session=False)
+    ).scalar_one()
+    set_committed_value(profile, "resolved_questions", resolved)
+
+
+def _lock_question(db: Session, question_id: str) -> Optional[Question]:
+    """Load a question for update, serializing writers that moderate it."""
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite has no row locks; take the database write lock up front
+        # unless this transaction already holds it.
+        connection = db.connection()
+        if not connection.connection.dbapi_connection.in_transaction:
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+    return db.scalars(
+        select(Question).where(Question.id == question_id).with_for_update()
+    ).first()
 
 
 def _ensure_expert_profile(user: Optional[User], db: Session) -> None:
@@ -68,6 +290,28 @@ def _ensure_expert_profile(user: Optional[User], db: Session) -> None:
     user.expert_profile = profile
 
 
+def _question_fields(payload: QuestionCreate) -> Dict[str, Any]:
+    tags = _clean_list(payload.tags)
+    links = _clean_list(payload.links)
+
+    if payload.code_link:
+        if payload.code_link not in links:
+            links.insert(0, payload.code_link)
+
+    return {
+        "title": payload.title,
+        "description": payload.description,
+        "code_example": payload.code_example,
+        "category": payload.category,
+        "subcategory": payload.subcategory,
+        "difficulty": payload.difficulty,
+        "tags": tags,
+        "links": links,
+        "deadline": payload.deadline,
+        "status": payload.status or "published",
+    }
+
+
 def question_to_schema(question: Question) -> QuestionOut:
     tags = question.tags or []
     links = question.links or []
@@ -79,7 +323,7 @@ def question_to_schema(question: Question) -> QuestionOut:
 
     client = question.client
     client_profile = (
-        _profile_to_schema(client.expert_profile) if client else None
+        profile_to_schema(client.expert_profile) if client else None
     )
 
     return QuestionOut(
@@ -100,7 +344,7 @@ def question_to_schema(question: Question) -> QuestionOut:
         client_email=client.email if client else None,
         client_role=client.role if client else None,
         client_profile=client_profile,
-        answers_count=len(question.answers or []),
+        answers_count=question.answers_count or 0,
         is_solved=is_solved,
         accepted_answer_id=question.accepted_answer_id,
         created_at=question.created_at,
@@ -111,9 +355,9 @@ def question_to_schema(question: Question) -> QuestionOut:
 def answer_to_schema(answer: Answer) -> AnswerOut:
     author = answer.author
     author_profile = (
-        _profile_to_schema(author.expert_profile) if author else None
+        profile_to_schema(author.expert_profile) if author else None
     )
-    author_answers_count = len(author.answers or []) if author else 0
+    author_answers_count = (author.answers_count or 0) if author else 0
 
     return AnswerOut(
         id=answer.id,
@@ -135,54 +379,91 @@ def answer_to_schema(answer: Answer) -> AnswerOut:
 
 
 @router.get("/", response_model=QuestionListResponse)
-def list_questions(
-    db: Session = Depends(get_db),
+async def list_questions(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
     category: Optional[str] = None,
     difficulty: Optional[str] = None,
     status_filter: Optional[str] = Query("published"),
     tags: Optional[List[str]] = Query(None),
-) -> QuestionListResponse:
-    query = (
-        db.query(Question)
-        .options(
-            joinedload(Question.client).joinedload(User.expert_profile),
-            joinedload(Question.answers),
-        )
-        .order_by(Question.created_at.desc())
-    )
-
-    if category:
-        query = query.filter(Question.category == category)
-    if difficulty:
-        query = query.filter(Question.difficulty == difficulty)
-    if status_filter and status_filter.lower() != "all":
-        normalized = status_filter.lower()
-        if normalized == "published":
-            query = query.filter(Question.status.in_(["published", "resolved"]))
-        else:
-            query = query.filter(Question.status == status_filter)
-
-    questions = query.all()
+    cursor: Optional[str] = None,
+    stream: bool = False,
+) -> Response:
+    """
+    A page of questions. `?stream=true` streams the same envelope without
+    caching; `Accept: application/x-ndjson` streams bare items, one per line.
+    """
+    fmt = stream_format(request, stream)
+    if fmt is None:
+        generation = response_cache.generation()
+        cache_key = response_cache.key_for(request)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    filters = _question_filters(category, difficulty, None, tags)
+    statuses = status_values(status_filter)
+
+    # Cursor mode seeks the feed indexes from the last seen row and skips
+    # the COUNT(*); offset mode is kept for existing clients. One row past
+    # the page tells whether there is a next cursor.
+    total = None
+    if cursor:
+        keys = page_keys(filters, statuses, _decode_cursor(cursor))
+        query = page_query(keys, limit + 1)
+    else:
+        if fmt != "ndjson":
+            counted = filters + ([status_condition(statuses)] if statuses else [])
+            total = await db.scalar(select(func.count(Question.id)).where(*counted)) or 0
+        query = page_query(page_keys(filters, statuses), limit + 1, offset)
 
-    if tags:
-        normalized_tags = {tag.lower() for tag in tags if tag}
-        filtered = []
-        for question in questions:
-            existing_tags = {tag.lower() for tag in (question.tags or [])}
-            if normalized_tags.issubset(existing_tags):
-                filtered.append(question)
-        questions = filtered
+    if fmt is not None:
+        return _stream_question_page(request, query, limit, total, fmt)
 
-    total = len(questions)
-    slice_end = offset + limit
-    items = questions[offset:slice_end]
+    rows = (await db.scalars(query)).all()
+    items = rows[:limit]
+    next_cursor = _encode_cursor(items[-1]) if len(rows) > limit else None
 
-    return QuestionListResponse(
+    body = QuestionListResponse(
         total=total,
         items=[question_to_schema(question) for question in items],
+        next_cursor=next_cursor,
     )
+    cache_tags = [category_tag(category) if category else QUESTIONS_TAG]
+    cache_tags += [user_tag(question.client_id) for question in items]
+    return response_cache.store(
+        cache_key,
+        body.model_dump_json(by_alias=True).encode(),
+        cache_tags,
+        generation=generation,
+        replica=served_by_replica(request),
+    )
+
+
+def _stream_question_page(
+    request: Request, query, limit: int, total: Optional[int], fmt: str
+) -> StreamingResponse:
+    # `query` reads one row past the page; it is never emitted.
+    seen = 0
+    last: Optional[QuestionOut] = None
+
+    async def items():
+        nonlocal seen, last
+        rows = aiter_schemas(async_read_session_factory(request), query, question_to_schema)
+        async for item in rows:
+            seen += 1
+            if seen <= limit:
+                last = item
+                yield item
+
+    def suffix() -> bytes:
+        next_cursor = _encode_cursor(last) if seen > limit else None
+        return f"],\"nextCursor\":{json.dumps(next_cursor)}}}".encode()
+
+    prefix = f"{{\"total\":{json.dumps(total)},\"items\":[".encode()
+    return streaming_list_response(items(), fmt, prefix, suffix)
 
 
 @router.post(
@@ -195,48 +476,348 @@ def create_question(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> QuestionOut:
-    tags = _clean_list(payload.tags)
-    links = _clean_list(payload.links)
-
-    if payload.code_link:
-        if payload.code_link not in links:
-            links.insert(0, payload.code_link)
-
-    question = Question(
-        title=payload.title,
-        description=payload.description,
-        code_example=payload.code_example,
-        category=payload.category,
-        subcategory=payload.subcategory,
-        difficulty=payload.difficulty,
-        tags=tags,
-        links=links,
-        deadline=payload.deadline,
-        status=payload.status or "published",
-        client_id=current_user.id,
-    )
+    question = Question(**_question_fields(payload), client_id=current_user.id)
+    _sync_question_tags(question)
 
     db.add(question)
     db.commit()
     db.refresh(question)
+    response_cache.invalidate(*_question_cache_tags(question))
 
     return question_to_schema(question)
 
 
-@router.get("/{question_id}", response_model=QuestionOut)
-def get_question(question_id: str, db: Session = Depends(get_db)) -> QuestionOut:
-    question = (
-        db.query(Question)
-        .options(
-            joinedload(Question.client).joinedload(User.expert_profile),
-            joinedload(Question.answers),
+def _validate_import_row(
+    index: int, raw: Any, result: BulkImportResponse
+) -> Optional[QuestionImport]:
+    try:
+        return QuestionImport.model_validate(raw)
+    except ValidationError as exc:
+        detail = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+            for error in exc.errors()
+        )
+        result.errors.append(BulkRowError(index=index, detail=detail))
+        return None
+
+
+def _import_chunk(
+    db: Session,
+    current_user: User,
+    chunk: List[Tuple[int, QuestionImport]],
+    result: BulkImportResponse,
+) -> None:
+    """
+    Insert one chunk with multi-row INSERTs in a single transaction.
+
+    Core inserts skip the ORM flush hooks, so counters, tag counts and
+    answer counts are updated here explicitly.
+    """
+    now = datetime.utcnow()
+    expert_name = _client_name(current_user)
+    expert_rating = (
+        current_user.expert_profile.average_rating if current_user.expert_profile else 0.0
+    )
+    question_rows: List[Dict[str, Any]] = []
+    tag_rows: List[Dict[str, Any]] = []
+    answer_rows: List[Dict[str, Any]] = []
+    counter_deltas: Counter = Counter()
+    tag_deltas: Counter = Counter()
+
+    for _, item in chunk:
+        fields = _question_fields(item)
+        question_id = str(uuid.uuid4())
+        question_rows.append(
+            {
+                **fields,
+                "id": question_id,
+                "client_id": current_user.id,
+                "answers_count": len(item.answers),
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        counter_deltas.update(question_deltas(fields["status"], fields["category"], 1))
+        for tag in _normalize_tags(fields["tags"]):
+            tag_rows.append({"question_id": question_id, "tag": tag})
+            tag_deltas[(fields["category"], tag)] += 1
+        for answer in item.answers:
+            answer_rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "question_id": question_id,
+                    "author_id": current_user.id,
+                    "answer_text": answer.answer_text,
+                    "code_example": answer.code_example,
+                    "links": _clean_list(answer.links),
+                    "expert_name": expert_name,
+                    "expert_rating": expert_rating,
+                    "is_accepted": False,
+                    "created_at": now,
+                }
+            )
+
+    try:
+        db.execute(insert(Question), question_rows)
+        if tag_rows:
+            db.execute(insert(QuestionTag), tag_rows)
+        if answer_rows:
+            db.execute(insert(Answer), answer_rows)
+            current_user.answers_count = User.answers_count + len(answer_rows)
+        apply_deltas(db.connection(), counter_deltas)
+        apply_tag_deltas(db.connection(), tag_deltas)
+        db.commit()
+    except SQLAlchemyError as exc:
+        db.rollback()
+        detail = f"Not stored, its batch failed: {exc.__class__.__name__}"
+        result.errors.extend(BulkRowError(index=index, detail=detail) for index, _ in chunk)
+        return
+
+    result.created += len(question_rows)
+    result.ids.extend(row["id"] for row in question_rows)
+
+
+def _invalidate_imported(
+    current_user: User, categories: set, result: BulkImportResponse
+) -> None:
+    if result.created:
+        response_cache.invalidate(
+            QUESTIONS_TAG,
+            user_tag(current_user.id),
+            EXPERTS_TAG,
+            *(category_tag(category) for category in categories),
+        )
+
+
+@router.post("/bulk", response_model=BulkImportResponse)
+def bulk_create_questions(
+    payload: List[Any] = Body(..., max_length=BULK_MAX_ROWS),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> BulkImportResponse:
+    """Create many questions (optionally with `answers`); errors are reported per row."""
+    result = BulkImportResponse()
+    valid: List[Tuple[int, QuestionImport]] = []
+    for index, raw in enumerate(payload):
+        item = _validate_import_row(index, raw, result)
+        if item:
+            valid.append((index, item))
+
+    for start in range(0, len(valid), IMPORT_CHUNK_SIZE):
+        _import_chunk(db, current_user, valid[start : start + IMPORT_CHUNK_SIZE], result)
+    _invalidate_imported(current_user, {item.category for _, item in valid}, result)
+    result.errors.sort(key=lambda error: error.index)
+    return result
+
+
+@router.post("/import", response_model=BulkImportResponse)
+async def import_questions(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> BulkImportResponse:
+    """
+    Stream an NDJSON body of questions (one JSON object per line, with
+    optional `answers`) into the database, `IMPORT_CHUNK_SIZE` rows per
+    transaction. A line longer than `IMPORT_MAX_LINE_BYTES` stops the
+    import with 413; the lines before it are kept.
+    """
+    result = BulkImportResponse()
+    pending: List[Tuple[int, QuestionImport]] = []
+    categories = set()
+
+    def parse(index: int, line: bytes) -> None:
+        if not line.strip():
+            return
+        try:
+            raw = json.loads(line)
+        except ValueError:
+            result.errors.append(BulkRowError(index=index, detail="Invalid JSON"))
+            return
+        item = _validate_import_row(index, raw, result)
+        if item:
+            pending.append((index, item))
+            categories.add(item.category)
+
+    async def line_too_long(index: int) -> HTTPException:
+        if pending:
+            await run_in_threadpool(_import_chunk, db, current_user, pending, result)
+        _invalidate_imported(current_user, categories, result)
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=(
+                f"Line {index} is longer than {IMPORT_MAX_LINE_BYTES} bytes; "
+                f"{result.created} questions before it were imported"
+            ),
+        )
+
+    index = 0
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if len(line) > IMPORT_MAX_LINE_BYTES:
+                raise await line_too_long(index)
+            parse(index, line)
+            index += 1
+        if len(buffer) > IMPORT_MAX_LINE_BYTES:
+            raise await line_too_long(index)
+        if len(pending) >= IMPORT_CHUNK_SIZE:
+            await run_in_threadpool(_import_chunk, db, current_user, pending, result)
+            pending = []
+    parse(index, buffer)
+    if pending:
+        await run_in_threadpool(_import_chunk, db, current_user, pending, result)
+
+    _invalidate_imported(current_user, categories, result)
+    return result
+
+
+def _export_lines(filters: list) -> Iterator[bytes]:
+    # Runs after the request's dependencies have closed, so it owns its
+    # session; rows are read in keyset batches and released after each.
+    with SessionLocal() as db:
+        after: Optional[Tuple[datetime, str]] = None
+        while True:
+            query = (
+                select(Question)
+                .options(joinedload(Question.client).joinedload(User.expert_profile))
+                .where(*filters)
+                .order_by(Question.created_at, Question.id)
+                .limit(EXPORT_BATCH_SIZE)
+            )
+            if after:
+                query = query.where(
+                    or_(
+                        Question.created_at > after[0],
+                        and_(Question.created_at == after[0], Question.id > after[1]),
+                    )
+                )
+            questions = db.scalars(query).all()
+            if not questions:
+                return
+
+            answers: Dict[str, List[AnswerOut]] = {}
+            for answer in db.scalars(
+                select(Answer)
+                .options(joinedload(Answer.author).joinedload(User.expert_profile))
+                .where(Answer.question_id.in_([question.id for question in questions]))
+                .order_by(Answer.question_id, Answer.created_at)
+            ):
+                answers.setdefault(answer.question_id, []).append(answer_to_schema(answer))
+
+            for question in questions:
+                line = QuestionExport(
+                    **dict(question_to_schema(question)),
+                    answers=answers.get(question.id, []),
+                )
+                yield line.model_dump_json(by_alias=True).encode() + b"\n"
+
+            after = (questions[-1].created_at, questions[-1].id)
+            db.expunge_all()
+
+
+@router.get("/export")
+def export_questions(
+    category: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    status_filter: Optional[str] = Query("published"),
+    tags: Optional[List[str]] = Query(None),
+    current_user: User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """Stream matching questions with their answers as NDJSON, oldest first."""
+    filters = _question_filters(category, difficulty, status_filter, tags)
+    return StreamingResponse(_export_lines(filters), media_type="application/x-ndjson")
+
+
+@router.get("/search", response_model=QuestionSearchResponse)
+async def search_questions(
+    q: str = Query(..., min_length=1, max_length=200),
+    db: AsyncSession = Depends(get_async_read_db),
+    limit: int = Query(20, ge=1, le=50),
+    category: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    status_filter: Optional[str] = Query("published"),
+    tags: Optional[List[str]] = Query(None),
+    cursor: Optional[str] = None,
+) -> SchemaResponse:
+    dialect = db.bind.dialect.name
+    if not is_supported(dialect):
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Search is not available for this database",
+        )
+    terms = search_terms(q)
+    if not terms:
+        return SchemaResponse(QuestionSearchResponse(items=[]))
+
+    query, rank = search_select(dialect, terms)
+    query = (
+        query.options(joinedload(Question.client).joinedload(User.expert_profile))
+        .where(*_question_filters(category, difficulty, status_filter, tags))
+        .order_by(rank, Question.id)
+    )
+    if cursor:
+        after_rank, question_id = _unpack_cursor(cursor, float)
+        query = query.where(
+            or_(rank > after_rank, and_(rank == after_rank, Question.id > question_id))
+        )
+
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = _pack_cursor(repr(last[1]), last[0].id)
+
+    return SchemaResponse(
+        QuestionSearchResponse(
+            items=[
+                QuestionSearchHit(
+                    question=question_to_schema(question),
+                    title_highlight=render_highlight(title_highlight),
+                    snippet=render_highlight(snippet),
+                )
+                for question, _, title_highlight, snippet in items
+            ],
+            next_cursor=next_cursor,
         )
-        .filter(Question.id == question_id)
-        .first()
+    )
+
+
+@router.get("/{question_id}", response_model=QuestionOut)
+async def get_question(
+    question_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+) -> Response:
+    generation = response_cache.generation()
+    etag = await _question_etag(db, question_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    headers = {"ETag": etag}
+    cache_key = response_cache.key_for(request, etag)
+    cached = response_cache.get(cache_key, headers)
+    if cached is not None:
+        return cached
+
+    question = await db.scalar(
+        select(Question)
+        .options(joinedload(Question.client).joinedload(User.expert_profile))
+        .where(Question.id == question_id)
     )
     if not question:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found")
-    return question_to_schema(question)
+    body = question_to_schema(question).model_dump_json(by_alias=True).encode()
+    return response_cache.store(
+        cache_key,
+        body,
+        [question_tag(question.id), user_tag(question.client_id)],
+        headers,
+        generation=generation,
+        replica=served_by_replica(request),
+    )
 
 
 @router.put("/{question_id}", response_model=QuestionOut)
@@ -254,10 +835,12 @@ def update_question(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only update your own questions",
         )
+    cache_tags = _question_cache_tags(question)
 
     for field, value in payload.model_dump(exclude_unset=True).items():
         if field == "tags":
             question.tags = _clean_list(value)
+            _sync_question_tags(question)
         elif field == "links":
             question.links = _clean_list(value)
         elif field == "code_link" and value:
@@ -273,6 +856,7 @@ def update_question(
     db.add(question)
     db.commit()
     db.refresh(question)
+    response_cache.invalidate(*cache_tags, category_tag(question.category))
 
     return question_to_schema(question)
 
@@ -304,13 +888,20 @@ def delete_question(
     # If the question had accepted answers, decrement those authors' resolved counts
     for answer in question.answers or []:
         if answer.is_accepted:
-            _adjust_resolved_questions(answer.author, -1)
+            _adjust_resolved_questions(db, answer.author, -1)
 
     # Ensure expert profiles exist for authors before adjustments
     for ans in question.answers or []:
         _ensure_expert_profile(ans.author, db)
+
+    authors = {ans.author_id: ans.author for ans in question.answers or [] if ans.author}
+    removed = Counter(ans.author_id for ans in question.answers or [])
+    for author_id, author in authors.items():
+        author.answers_count = User.answers_count - removed[author_id]
+    cache_tags = _question_cache_tags(question) + [user_tag(a) for a in authors]
     db.delete(question)
     db.commit()
+    response_cache.invalidate(*cache_tags, EXPERTS_TAG)
 
 
 @router.post("/{question_id}/submit", response_model=QuestionOut)
@@ -331,28 +922,74 @@ def submit_question_for_review(
     db.add(question)
     db.commit()
     db.refresh(question)
+    response_cache.invalidate(*_question_cache_tags(question))
     return question_to_schema(question)
 
 
 @router.get("/{question_id}/answers", response_model=List[AnswerOut])
-def list_answers(question_id: str, db: Session = Depends(get_db)) -> List[AnswerOut]:
-    question = (
-        db.query(Question)
+async def list_answers(
+    question_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    limit: int = Query(ANSWERS_PAGE_SIZE, ge=1, le=ANSWERS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> Response:
+    """
+    Answers of a question, accepted first, then oldest first. The body stays
+    a plain list; the cursor of the next page is sent in `X-Next-Cursor`.
+    """
+    generation = response_cache.generation()
+    etag = await _question_etag(db, question_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    headers = {"ETag": etag}
+    cache_key = response_cache.key_for(request, etag)
+    cached = response_cache.get(cache_key, headers)
+    if cached is not None:
+        return cached
+
+    # Author aggregates are columns on the author rows, so one statement
+    # loads the page, its authors and their profiles.
+    query = (
+        select(Answer)
         .options(
-            joinedload(Question.answers)
-            .joinedload(Answer.author)
-            .joinedload(User.expert_profile),
-            joinedload(Question.answers)
-            .joinedload(Answer.author)
-            .joinedload(User.answers),
+            joinedload(Answer.question),
+            joinedload(Answer.author).joinedload(User.expert_profile),
         )
-        .filter(Question.id == question_id)
-        .first()
+        .where(Answer.question_id == question_id)
+        .order_by(Answer.is_accepted.desc(), Answer.created_at, Answer.id)
+    )
+    if cursor:
+        (is_accepted, created_at), answer_id = _decode_answer_cursor(cursor)
+        later = or_(
+            Answer.created_at > created_at,
+            and_(Answer.created_at == created_at, Answer.id > answer_id),
+        )
+        if is_accepted:
+            query = query.where(
+                or_(Answer.is_accepted.is_(False), and_(Answer.is_accepted.is_(True), later))
+            )
+        else:
+            query = query.where(Answer.is_accepted.is_(False), later)
+
+    rows = (await db.scalars(query.limit(limit + 1))).all()
+    page = rows[:limit]
+    stored_headers = {}
+    if len(rows) > limit:
+        stored_headers["X-Next-Cursor"] = _encode_answer_cursor(page[-1])
+
+    answers = [answer_to_schema(answer) for answer in page]
+    cache_tags = [question_tag(question_id)]
+    cache_tags += [user_tag(answer.author_id) for answer in page]
+    return response_cache.store(
+        cache_key,
+        _answer_list_adapter.dump_json(answers, by_alias=True),
+        cache_tags,
+        headers,
+        stored_headers,
+        generation=generation,
+        replica=served_by_replica(request),
     )
-    if not question:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found")
-
-    return [answer_to_schema(answer) for answer in question.answers]
 
 
 @router.post(
@@ -390,12 +1027,21 @@ def create_answer(
         ),
     )
 
+    question.answers_count = Question.answers_count + 1
+    current_user.answers_count = User.answers_count + 1
+    cache_tags = _question_cache_tags(question) + [user_tag(current_user.id)]
+
     db.add(answer)
     db.commit()
     db.refresh(answer)
     answer.question = question
+    response_cache.invalidate(*cache_tags, EXPERTS_TAG)
 
-    return answer_to_schema(answer)
+    body = answer_to_schema(answer)
+    event_broker.publish(
+        question_topic(question.id), ANSWER_CREATED, {"questionId": question.id, "answer": body}
+    )
+    return body
 
 
 @router.put("/{question_id}/answers/{answer_id}", response_model=AnswerOut)
@@ -432,7 +1078,12 @@ def update_answer(
     db.add(answer)
     db.commit()
     db.refresh(answer)
-    return answer_to_schema(answer)
+    response_cache.invalidate(question_tag(answer.question_id))
+    body = answer_to_schema(answer)
+    event_broker.publish(
+        question_topic(question_id), ANSWER_UPDATED, {"questionId": question_id, "answer": body}
+    )
+    return body
 
 
 @router.delete("/{question_id}/answers/{answer_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -460,26 +1111,27 @@ def delete_answer(
 
     # If accepted, decrement author's resolved count
     if answer.is_accepted:
-        _adjust_resolved_questions(answer.author, -1)
+        _adjust_resolved_questions(db, answer.author, -1)
+    if answer.author:
+        answer.author.answers_count = User.answers_count - 1
 
     # Update question acceptance state
-    question = (
-        db.query(Question)
-        .options(joinedload(Question.answers))
-        .filter(Question.id == question_id)
-        .first()
-    )
+    question = db.query(Question).filter(Question.id == question_id).first()
 
     if question:
-        # remove from relationship to avoid re-attach of deleted instance
-        if question.answers and answer in question.answers:
-            question.answers.remove(answer)
+        question.answers_count = Question.answers_count - 1
 
         if question.accepted_answer_id == answer.id:
             question.accepted_answer_id = None
             # If there is another accepted answer, keep it; otherwise mark published
-            replacement = next(
-                (a for a in question.answers if getattr(a, "is_accepted", False)), None
+            replacement = (
+                db.query(Answer.id)
+                .filter(
+                    Answer.question_id == question.id,
+                    Answer.is_accepted.is_(True),
+                    Answer.id != answer.id,
+                )
+                .first()
             )
             if replacement:
                 question.accepted_answer_id = replacement.id
@@ -488,8 +1140,15 @@ def delete_answer(
                 question.status = "published"
         db.add(question)
 
+    cache_tags = [question_tag(question_id), user_tag(answer.author_id), EXPERTS_TAG]
+    event = {"questionId": question_id, "answerId": answer.id}
+    if question:
+        cache_tags += _question_cache_tags(question)
+        event.update(status=question.status, acceptedAnswerId=question.accepted_answer_id)
     db.delete(answer)
     db.commit()
+    response_cache.invalidate(*cache_tags)
+    event_broker.publish(question_topic(question_id), ANSWER_DELETED, event)
 
 
 @router.post(
@@ -503,12 +1162,10 @@ def verify_answer(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> AnswerOut:
-    question = (
-        db.query(Question)
-        .options(joinedload(Question.client))
-        .filter(Question.id == question_id)
-        .first()
-    )
+    # One transaction: lock the question, load the target and the accepted
+    # answers together, move counters with atomic UPDATEs and build the
+    # response from the session before committing.
+    question = _lock_question(db, question_id)
     if not question:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Question not found"
@@ -519,71 +1176,57 @@ def verify_answer(
             detail="Only the question owner can verify answers",
         )
 
-    answer = (
-        db.query(Answer)
+    candidates = db.scalars(
+        select(Answer)
         .options(joinedload(Answer.author).joinedload(User.expert_profile))
-        .filter(Answer.id == answer_id, Answer.question_id == question_id)
-        .first()
-    )
+        .where(
+            Answer.question_id == question_id,
+            or_(Answer.id == answer_id, Answer.is_accepted.is_(True)),
+        )
+        .order_by(Answer.created_at, Answer.id)
+    ).all()
+    answer = next((item for item in candidates if item.id == answer_id), None)
     if not answer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Answer not found"
         )
+    other_accepted = [item for item in candidates if item.is_accepted and item is not answer]
 
-    is_marked_correct = payload.is_correct
-
-    if is_marked_correct:
+    delta = 0
+    unaccepted = []
+    if payload.is_correct:
         _ensure_expert_profile(answer.author, db)
-        other_author_answers = (
-            db.query(Answer)
-            .options(joinedload(Answer.author).joinedload(User.expert_profile))
-            .filter(
-                Answer.question_id == question_id,
-                Answer.author_id == answer.author_id,
-                Answer.is_accepted.is_(True),
-                Answer.id != answer.id,
-            )
-            .all()
-        )
-        for other in other_author_answers:
-            other.is_accepted = False
-            _adjust_resolved_questions(other.author, -1)
+        # An author keeps at most one accepted answer per question.
+        for other in other_accepted:
+            if other.author_id == answer.author_id:
+                other.is_accepted = False
+                unaccepted.append(other.id)
+                delta -= 1
         if not answer.is_accepted:
             answer.is_accepted = True
-            _adjust_resolved_questions(answer.author, 1)
+            delta += 1
         question.accepted_answer_id = answer.id
         question.status = "resolved"
     else:
         if answer.is_accepted:
-            _adjust_resolved_questions(answer.author, -1)
-        answer.is_accepted = False
+            answer.is_accepted = False
+            delta -= 1
         if question.accepted_answer_id == answer.id:
-            question.accepted_answer_id = None
-            replacement = (
-                db.query(Answer)
-                .filter(
-                    Answer.question_id == question.id,
-                    Answer.is_accepted.is_(True),
-                )
-                .first()
-            )
-            if replacement:
-                question.accepted_answer_id = replacement.id
+            question.accepted_answer_id = other_accepted[0].id if other_accepted else None
         if not question.accepted_answer_id:
             question.status = "published"
-
-    db.add(question)
-    db.add(answer)
+    _adjust_resolved_questions(db, answer.author, delta)
+
+    body = answer_to_schema(answer)
+    cache_tags = _question_cache_tags(question) + [user_tag(answer.author_id)]
+    event = {
+        "questionId": question.id,
+        "answer": body,
+        "status": question.status,
+        "acceptedAnswerId": question.accepted_answer_id,
+        "unacceptedAnswerIds": unaccepted,
+    }
     db.commit()
-    updated_answer = (
-        db.query(Answer)
-        .options(joinedload(Answer.author).joinedload(User.expert_profile))
-        .filter(Answer.id == answer.id)
-        .first()
-    )
-    if updated_answer:
-        updated_answer.question = question
-        return answer_to_schema(updated_answer)
-    answer.question = question
-    return answer_to_schema(answer)
-
+    response_cache.invalidate(*cache_tags, EXPERTS_TAG)
+    event_broker.publish(question_topic(question_id), ANSWER_VERIFIED, event)
+    return body
@@ -1,33 +1,40 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
-from ..models import Question, User
+from .. import counters
+from ..core.rendering import SchemaResponse
+from ..database import get_async_read_db
 from ..schemas.stats import PlatformStats
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
 
 @router.get("", response_model=PlatformStats)
-def platform_stats(db: Session = Depends(get_db)) -> PlatformStats:
-    total_questions = db.query(func.count(Question.id)).scalar() or 0
-    # Count all registered users as IT specialists
-    total_experts = db.query(func.count(User.id)).scalar() or 0
-    resolved_questions = (
-        db.query(func.count(Question.id))
-        .filter(Question.status == "resolved")
-        .scalar()
-        or 0
+async def platform_stats(
+    db: AsyncSession = Depends(get_async_read_db),
+) -> SchemaResponse:
+    values = await counters.read_counters(
+        db,
+        [
+            counters.QUESTIONS_TOTAL,
+            counters.USERS_TOTAL,
+            counters.status_key("resolved"),
+        ],
     )
+    total_questions = values.get(counters.QUESTIONS_TOTAL, 0)
+    # Count all registered users as IT specialists
+    total_experts = values.get(counters.USERS_TOTAL, 0)
+    resolved_questions = values.get(counters.status_key("resolved"), 0)
 
     success_rate = 0.0
     if total_questions:
         success_rate = round((resolved_questions / total_questions) * 100, 2)
 
-    return PlatformStats(
-        total_questions=total_questions,
-        total_experts=total_experts,
-        success_rate=success_rate,
+    return SchemaResponse(
+        PlatformStats(
+            total_questions=total_questions,
+            total_experts=total_experts,
+            success_rate=success_rate,
+        )
     )
 
@@ -0,0 +1,80 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.rendering import SchemaResponse
+from ..database import get_async_read_db
+from ..models import CategoryTag, Tag
+from ..schemas.tag import CategoryTags, TagOut
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+
+def _prefix_range(column, prefix: str) -> list:
+    # A key range instead of LIKE so the primary key index serves the lookup.
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return [column >= prefix, column < upper]
+
+
+@router.get("", response_model=List[TagOut])
+async def list_tags(
+    db: AsyncSession = Depends(get_async_read_db),
+    prefix: Optional[str] = Query(None, max_length=100),
+    category: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+) -> SchemaResponse:
+    """Most used tags, optionally within a category and starting with `prefix`."""
+    if category:
+        name, count = CategoryTag.tag, CategoryTag.questions_count
+        query = select(name, count).where(CategoryTag.category == category)
+    else:
+        name, count = Tag.name, Tag.questions_count
+        query = select(name, count)
+
+    prefix = (prefix or "").strip().lower()
+    if prefix:
+        query = query.where(*_prefix_range(name, prefix))
+
+    result = await db.execute(
+        query.where(count > 0).order_by(count.desc(), name).limit(limit)
+    )
+    return SchemaResponse(
+        [TagOut(name=tag, questions_count=total) for tag, total in result.all()]
+    )
+
+
+@router.get("/popular", response_model=List[CategoryTags])
+async def popular_tags_by_category(
+    db: AsyncSession = Depends(get_async_read_db),
+    limit: int = Query(5, ge=1, le=20),
+) -> SchemaResponse:
+    """Top `limit` tags of every category."""
+    ranked = (
+        select(
+            CategoryTag.category,
+            CategoryTag.tag,
+            CategoryTag.questions_count,
+            func.row_number()
+            .over(
+                partition_by=CategoryTag.category,
+                order_by=(CategoryTag.questions_count.desc(), CategoryTag.tag),
+            )
+            .label("position"),
+        )
+        .where(CategoryTag.questions_count > 0)
+        .subquery()
+    )
+    result = await db.execute(
+        select(ranked.c.category, ranked.c.tag, ranked.c.questions_count)
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.category, ranked.c.position)
+    )
+
+    groups: List[CategoryTags] = []
+    for category, tag, total in result.all():
+        if not groups or groups[-1].category != category:
+            groups.append(CategoryTags(category=category, tags=[]))
+        groups[-1].tags.append(TagOut(name=tag, questions_count=total))
+    return SchemaResponse(groups)
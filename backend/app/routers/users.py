@@ -1,9 +1,14 @@
-from typing import List
+from typing import List, Optional, Type
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import Session, contains_eager, joinedload
 
-from ..database import get_db
+from ..cache import EXPERTS_TAG, response_cache, user_tag
+from ..core.rendering import SchemaResponse
+from ..core.streaming import iter_schemas, stream_format, streaming_list_response
+from ..database import get_db, get_read_db, read_session_factory, served_by_replica
 from ..deps import get_current_active_user
 from ..models import Answer, ExpertProfile, Question, User
 from ..schemas.answer import AnswerOut
@@ -14,10 +19,20 @@ from ..schemas.user import (
     UserProfileResponse,
     UserPublic,
 )
-from .questions import answer_to_schema, question_to_schema
+from .questions import answer_to_schema, profile_to_schema, question_to_schema
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+_user_list_adapter = TypeAdapter(List[UserPublic])
+_question_list_adapter = TypeAdapter(List[QuestionOut])
+_answer_list_adapter = TypeAdapter(List[AnswerOut])
+
+EXPERT_SORT_COLUMNS = {
+    "resolved_questions": ExpertProfile.resolved_questions,
+    "average_rating": ExpertProfile.average_rating,
+    "answers_count": User.answers_count,
+}
+
 
 def _get_user_or_404(db: Session, user_id: str) -> User:
     user = (
@@ -33,11 +48,59 @@ def _get_user_or_404(db: Session, user_id: str) -> User:
     return user
 
 
+def _has_skill(dialect: str, skill: str):
+    """
+    Whether the profile's JSON skills list has an element equal to `skill`,
+    ignoring case. Elements are compared decoded (stored JSON escapes
+    non-ASCII characters); SQLite's lower() folds ASCII letters only, so
+    there other scripts match case-sensitively.
+    """
+    elements = func.json_each if dialect == "sqlite" else func.json_array_elements_text
+    element = elements(ExpertProfile.skills).table_valued("value")
+    return exists(
+        select(1).select_from(element).where(func.lower(element.c.value) == func.lower(skill))
+    )
+
+
+def _user_to_schema(user: User, schema: Type[UserPublic] = UserPublic) -> UserPublic:
+    # Built without validation: re-checking stored emails as EmailStr
+    # dominated the cost of rendering user lists.
+    return schema.model_construct(
+        id=user.id,
+        email=user.email,
+        username=user.username,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        role=user.role,
+        is_active=user.is_active,
+        created_at=user.created_at,
+        expert_profile=profile_to_schema(user.expert_profile),
+        answers_count=user.answers_count or 0,
+    )
+
+
+def _cached_profile(request: Request, db: Session, user_id: str) -> Response:
+    generation = response_cache.generation()
+    cache_key = response_cache.key_for(request)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    user = _get_user_or_404(db, user_id)
+    body = _user_to_schema(user)
+    return response_cache.store(
+        cache_key,
+        body.model_dump_json(by_alias=True).encode(),
+        [user_tag(user.id)],
+        generation=generation,
+        replica=served_by_replica(request),
+    )
+
+
 @router.get("/me", response_model=UserProfileResponse)
 def get_current_user_profile(
     current_user: User = Depends(get_current_active_user),
-) -> UserProfileResponse:
-    return UserProfileResponse.model_validate(current_user, from_attributes=True)
+) -> SchemaResponse:
+    return SchemaResponse(_user_to_schema(current_user, UserProfileResponse))
 
 
 @router.put("/me/profile", response_model=ExpertProfilePublic)
@@ -72,78 +135,140 @@ def update_expert_profile(
     db.add(profile)
     db.commit()
     db.refresh(profile)
+    response_cache.invalidate(user_tag(current_user.id), EXPERTS_TAG)
 
-    return ExpertProfilePublic.model_validate(profile, from_attributes=True)
+    return profile_to_schema(profile)
 
 
 @router.get("/experts", response_model=List[UserPublic])
-def list_experts(db: Session = Depends(get_db)) -> List[UserPublic]:
-    experts = (
-        db.query(User)
-        .outerjoin(ExpertProfile)
-        .filter(
+def list_experts(
+    request: Request,
+    db: Session = Depends(get_read_db),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    sort: str = Query(
+        "resolved_questions",
+        pattern="^(resolved_questions|average_rating|answers_count)$",
+    ),
+    skills: Optional[List[str]] = Query(None),
+    stream: bool = False,
+) -> Response:
+    fmt = stream_format(request, stream)
+    if fmt is None:
+        generation = response_cache.generation()
+        cache_key = response_cache.key_for(request)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # Profile and answer counts come from the same row, so this is one statement.
+    query = (
+        select(User)
+        .outerjoin(User.expert_profile)
+        .options(contains_eager(User.expert_profile))
+        .where(
             (User.role == "expert") | (ExpertProfile.id.isnot(None)),
             User.is_active.is_(True),
         )
-        .all()
     )
-    return [
-        UserPublic.model_validate(expert, from_attributes=True) for expert in experts
-    ]
+
+    for skill in skills or []:
+        skill = skill.strip()
+        if skill:
+            query = query.where(_has_skill(db.get_bind().dialect.name, skill))
+
+    query = (
+        query.order_by(
+            func.coalesce(EXPERT_SORT_COLUMNS[sort], 0).desc(),
+            User.created_at.asc(),
+            User.id.asc(),
+        )
+        .offset(offset)
+        .limit(limit)
+    )
+    if fmt is not None:
+        rows = iter_schemas(read_session_factory(request), query, _user_to_schema)
+        return streaming_list_response(rows, fmt)
+
+    experts = db.scalars(query).all()
+    body = [_user_to_schema(expert) for expert in experts]
+    return response_cache.store(
+        cache_key,
+        _user_list_adapter.dump_json(body, by_alias=True),
+        [EXPERTS_TAG] + [user_tag(expert.id) for expert in experts],
+        generation=generation,
+        replica=served_by_replica(request),
+    )
 
 
 @router.get("/profile/{user_id}", response_model=UserPublic)
-def get_user_public_profile(user_id: str, db: Session = Depends(get_db)) -> UserPublic:
-    user = _get_user_or_404(db, user_id)
-    return UserPublic.model_validate(user, from_attributes=True)
+def get_user_public_profile(
+    user_id: str, request: Request, db: Session = Depends(get_read_db)
+) -> Response:
+    return _cached_profile(request, db, user_id)
 
 
 @router.get("/{user_id}", response_model=UserPublic)
 def get_user_public_profile_alias(
-    user_id: str, db: Session = Depends(get_db)
-) -> UserPublic:
+    user_id: str, request: Request, db: Session = Depends(get_read_db)
+) -> Response:
     reserved_prefixes = {"me", "experts", "profile"}
     if user_id in reserved_prefixes:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
-    user = _get_user_or_404(db, user_id)
-    return UserPublic.model_validate(user, from_attributes=True)
+    return _cached_profile(request, db, user_id)
 
 
 @router.get("/me/questions", response_model=List[QuestionOut])
 def list_my_questions(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
-) -> List[QuestionOut]:
-    questions = (
-        db.query(Question)
-        .options(
-            joinedload(Question.client).joinedload(User.expert_profile),
-            joinedload(Question.answers),
-        )
-        .filter(Question.client_id == current_user.id)
+    stream: bool = False,
+) -> Response:
+    query = (
+        select(Question)
+        .options(joinedload(Question.client).joinedload(User.expert_profile))
+        .where(Question.client_id == current_user.id)
         .order_by(Question.created_at.desc())
-        .all()
     )
-    return [question_to_schema(question) for question in questions]
+    fmt = stream_format(request, stream)
+    if fmt is not None:
+        rows = iter_schemas(read_session_factory(request), query, question_to_schema)
+        return streaming_list_response(rows, fmt)
+
+    body = [question_to_schema(question) for question in db.scalars(query)]
+    return Response(
+        _question_list_adapter.dump_json(body, by_alias=True),
+        media_type="application/json",
+    )
 
 
 @router.get("/me/answers", response_model=List[AnswerOut])
 def list_my_answers(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
-) -> List[AnswerOut]:
-    answers = (
-        db.query(Answer)
+    stream: bool = False,
+) -> Response:
+    query = (
+        select(Answer)
         .options(
             joinedload(Answer.author),
             joinedload(Answer.question)
             .joinedload(Question.client)
             .joinedload(User.expert_profile),
-            joinedload(Answer.author).joinedload(User.answers),
         )
-        .filter(Answer.author_id == current_user.id)
+        .where(Answer.author_id == current_user.id)
         .order_by(Answer.created_at.desc())
-        .all()
     )
-    return [answer_to_schema(answer) for answer in answers]
+    fmt = stream_format(request, stream)
+    if fmt is not None:
+        rows = iter_schemas(read_session_factory(request), query, answer_to_schema)
+        return streaming_list_response(rows, fmt)
+
+    body = [answer_to_schema(answer) for answer in db.scalars(query)]
+    return Response(
+        _answer_list_adapter.dump_json(body, by_alias=True),
+        media_type="application/json",
+    )
 
@@ -3,6 +3,7 @@ from typing import List, Optional
 
 from pydantic import Field
 
+from .answer import AnswerCreate, AnswerOut
 from .common import CamelModel
 from .user import ExpertProfilePublic
 
@@ -53,6 +54,41 @@ class QuestionOut(QuestionBase):
     updated_at: Optional[datetime] = None
 
 
+class QuestionImport(QuestionCreate):
+    answers: List[AnswerCreate] = Field(default_factory=list)
+
+
+class BulkRowError(CamelModel):
+    # Position of the row: list index for /bulk, 0-based line for /import.
+    index: int
+    detail: str
+
+
+class BulkImportResponse(CamelModel):
+    created: int = 0
+    ids: List[str] = Field(default_factory=list)
+    errors: List[BulkRowError] = Field(default_factory=list)
+
+
+class QuestionExport(QuestionOut):
+    answers: List[AnswerOut] = Field(default_factory=list)
+
+
+class QuestionSearchHit(CamelModel):
+    question: QuestionOut
+    # HTML: the text is escaped and matches are wrapped in <mark>.
+    title_highlight: str
+    snippet: str
+
+
+class QuestionSearchResponse(CamelModel):
+    items: List[QuestionSearchHit]
+    next_cursor: Optional[str] = None
+
+
 class QuestionListResponse(CamelModel):
-    total: int
+    # `total` is only computed in offset mode; cursor pages leave it empty.
+    total: Optional[int] = None
     items: List[QuestionOut]
+    next_cursor: Optional[str] = None
+
@@ -0,0 +1,13 @@
+from typing import List
+
+from .common import CamelModel
+
+
+class TagOut(CamelModel):
+    name: str
+    questions_count: int = 0
+
+
+class CategoryTags(CamelModel):
+    category: str
+    tags: List[TagOut]
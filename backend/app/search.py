@@ -0,0 +1,260 @@
+"""
+Full-text search over questions and their answers.
+
+SQLite keeps an FTS5 table (`questions_fts`) and Postgres a weighted
+`tsvector` with a GIN index (`question_search`). Both are maintained by
+database triggers on `questions` and `answers`, so every write path
+(ORM, bulk SQL, migrations) keeps the index current without app code.
+"""
+
+import html
+import re
+from typing import List, Tuple
+
+from sqlalchemy import Float, cast, column, func, literal_column, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import ColumnElement, Select
+
+from .models import Question
+
+MAX_TERMS = 10
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+# The engines delimit matches with these control characters; the text is
+# HTML-escaped first and only then are matched pairs turned into <mark>.
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+_MATCH = re.compile(f"{_MATCH_START}([^{_MATCH_START}{_MATCH_END}]*){_MATCH_END}")
+
+# bm25 weights for title, description, code_example and answer text.
+_FTS5_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+_SQLITE_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS questions_fts_docs (
+        docid INTEGER PRIMARY KEY,
+        question_id VARCHAR NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+        title, description, code_example, answers, tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS questions_fts_insert AFTER INSERT ON questions BEGIN
+        INSERT INTO questions_fts_docs (question_id) VALUES (new.id);
+        INSERT INTO questions_fts (rowid, title, description, code_example, answers)
+        VALUES (
+            (SELECT docid FROM questions_fts_docs WHERE question_id = new.id),
+            new.title, new.description, new.code_example, ''
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS questions_fts_update
+    AFTER UPDATE OF title, description, code_example ON questions BEGIN
+        UPDATE questions_fts
+        SET title = new.title, description = new.description, code_example = new.code_example
+        WHERE rowid = (SELECT docid FROM questions_fts_docs WHERE question_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS questions_fts_delete AFTER DELETE ON questions BEGIN
+        DELETE FROM questions_fts
+        WHERE rowid = (SELECT docid FROM questions_fts_docs WHERE question_id = old.id);
+        DELETE FROM questions_fts_docs WHERE question_id = old.id;
+    END
+    """,
+    *[
+        f"""
+        CREATE TRIGGER IF NOT EXISTS answers_fts_{event.split()[0].lower()}
+        AFTER {event} ON answers BEGIN
+            UPDATE questions_fts
+            SET answers = coalesce((
+                SELECT group_concat(answer_text, ' ') FROM answers
+                WHERE question_id = {row}.question_id
+            ), '')
+            WHERE rowid = (
+                SELECT docid FROM questions_fts_docs WHERE question_id = {row}.question_id
+            );
+        END
+        """
+        for event, row in (
+            ("INSERT", "new"),
+            ("UPDATE OF answer_text", "new"),
+            ("DELETE", "old"),
+        )
+    ],
+]
+
+_SQLITE_BACKFILL = [
+    "INSERT INTO questions_fts_docs (question_id) SELECT id FROM questions",
+    """
+    INSERT INTO questions_fts (rowid, title, description, code_example, answers)
+    SELECT d.docid, q.title, q.description, q.code_example, coalesce((
+        SELECT group_concat(a.answer_text, ' ') FROM answers a WHERE a.question_id = q.id
+    ), '')
+    FROM questions q JOIN questions_fts_docs d ON d.question_id = q.id
+    """,
+]
+
+_POSTGRES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS question_search (
+        question_id VARCHAR PRIMARY KEY REFERENCES questions (id) ON DELETE CASCADE,
+        answers TEXT,
+        document TSVECTOR NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_question_search_document
+    ON question_search USING GIN (document)
+    """,
+    """
+    CREATE OR REPLACE FUNCTION question_search_refresh(qid VARCHAR) RETURNS void AS $$
+        INSERT INTO question_search (question_id, answers, document)
+        SELECT q.id, a.body,
+            setweight(to_tsvector('english', coalesce(q.title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(q.description, '')), 'B')
+            || setweight(to_tsvector('english', coalesce(q.code_example, '')), 'C')
+            || setweight(to_tsvector('english', coalesce(a.body, '')), 'D')
+        FROM questions q
+        LEFT JOIN LATERAL (
+            SELECT string_agg(answer_text, ' ') AS body FROM answers WHERE question_id = q.id
+        ) a ON true
+        WHERE q.id = qid
+        ON CONFLICT (question_id) DO UPDATE
+        SET answers = EXCLUDED.answers, document = EXCLUDED.document;
+    $$ LANGUAGE sql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION questions_search_trigger() RETURNS trigger AS $$
+    BEGIN
+        PERFORM question_search_refresh(NEW.id);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION answers_search_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM question_search_refresh(OLD.question_id);
+        END IF;
+        IF TG_OP <> 'DELETE' AND (TG_OP = 'INSERT' OR NEW.question_id <> OLD.question_id) THEN
+            PERFORM question_search_refresh(NEW.question_id);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS questions_search ON questions",
+    """
+    CREATE TRIGGER questions_search
+    AFTER INSERT OR UPDATE OF title, description, code_example ON questions
+    FOR EACH ROW EXECUTE FUNCTION questions_search_trigger()
+    """,
+    "DROP TRIGGER IF EXISTS answers_search ON answers",
+    """
+    CREATE TRIGGER answers_search
+    AFTER INSERT OR DELETE OR UPDATE OF answer_text, question_id ON answers
+    FOR EACH ROW EXECUTE FUNCTION answers_search_trigger()
+    """,
+]
+
+_POSTGRES_BACKFILL = [
+    """
+    SELECT question_search_refresh(q.id) FROM questions q
+    WHERE NOT EXISTS (SELECT 1 FROM question_search s WHERE s.question_id = q.id)
+    """,
+]
+
+
+def is_supported(dialect: str) -> bool:
+    return dialect in ("sqlite", "postgresql")
+
+
+def install_search_index(conn: Connection) -> None:
+    """Create the search index and its triggers; backfill existing rows once."""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        index_table, ddl, backfill = "questions_fts_docs", _SQLITE_DDL, _SQLITE_BACKFILL
+    elif dialect == "postgresql":
+        index_table, ddl, backfill = "question_search", _POSTGRES_DDL, _POSTGRES_BACKFILL
+    else:
+        return
+    is_new = not conn.dialect.has_table(conn, index_table)
+    for statement in ddl:
+        conn.execute(text(statement))
+    if is_new:
+        for statement in backfill:
+            conn.execute(text(statement))
+
+
+def search_terms(query: str) -> List[str]:
+    """Words from free text; operators and quotes are never passed to the engine."""
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def search_select(dialect: str, terms: List[str]) -> Tuple[Select, ColumnElement]:
+    """
+    `SELECT Question, rank, title_highlight, snippet` for `terms`, plus the
+    rank expression. Every term must match; the last one also as a prefix.
+    Lower ranks are better. Highlights are raw engine output; pass them
+    through `render_highlight` before they leave the app.
+    """
+    if dialect == "sqlite":
+        fts = table("questions_fts", column("rowid"))
+        docs = table("questions_fts_docs", column("docid"), column("question_id"))
+        fts_ref = literal_column("questions_fts")
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+        rank = func.bm25(fts_ref, *_FTS5_WEIGHTS)
+        title_highlight = func.highlight(fts_ref, 0, _MATCH_START, _MATCH_END)
+        snippet = func.snippet(fts_ref, -1, _MATCH_START, _MATCH_END, "…", 16)
+        stmt = (
+            select(Question, rank, title_highlight, snippet)
+            .select_from(fts)
+            .join(docs, docs.c.docid == fts.c.rowid)
+            .join(Question, Question.id == docs.c.question_id)
+            .where(fts_ref.op("MATCH")(match))
+        )
+        return stmt, rank
+
+    search = table(
+        "question_search", column("question_id"), column("answers"), column("document")
+    )
+    tsquery = func.to_tsquery(
+        "english", " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+    )
+    # Cast so the cursor round-trips the exact value through a Python float.
+    rank = -cast(func.ts_rank_cd(search.c.document, tsquery), Float)
+    options = f'StartSel="{_MATCH_START}", StopSel="{_MATCH_END}"'
+    title_highlight = func.ts_headline(
+        "english", Question.title, tsquery, options + ", HighlightAll=true"
+    )
+    snippet = func.ts_headline(
+        "english",
+        func.concat_ws(" ", Question.description, Question.code_example, search.c.answers),
+        tsquery,
+        options + ", MaxFragments=2, MaxWords=20, MinWords=5",
+    )
+    stmt = (
+        select(Question, rank, title_highlight, snippet)
+        .select_from(search)
+        .join(Question, Question.id == search.c.question_id)
+        .where(search.c.document.op("@@")(tsquery))
+    )
+    return stmt, rank
+
+
+def render_highlight(raw: str) -> str:
+    """
+    HTML for a highlight from `search_select`: the text escaped, matches in
+    <mark>. Delimiters that don't pair up (say, typed into a title) are
+    dropped rather than turned into tags.
+    """
+    escaped = html.escape(raw or "")
+    marked = _MATCH.sub(f"{HIGHLIGHT_START}\\1{HIGHLIGHT_END}", escaped)
+    return marked.replace(_MATCH_START, "").replace(_MATCH_END, "")
@@ -0,0 +1,91 @@
+"""
+bcrypt hashing off the event loop and the request threadpool.
+
+Hashes run in a small process pool so a login burst burns those processes'
+CPU instead of holding the threadpool slots every other endpoint needs.
+In-flight work is capped at one job per worker, and callers beyond
+`max_pending` are rejected with 503 instead of queueing without bound.
+Workers are started from a fork server (spawned where there is none),
+never forked from the threaded server process itself.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from ..core.config import get_settings
+from .security import pwd_context
+
+settings = get_settings()
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        # workers=0 falls back to the loop's default thread executor.
+        if self._executor is None and self.workers > 0:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(max(self.workers, 1))
+            self._loop = loop
+        return self._slots
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent sign-ins, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        try:
+            async with self._get_slots():
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """`(valid, new_hash)`; `new_hash` is set when the stored hash needs upgrading."""
+        return await self._run(_verify_and_update, password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    settings.password_hash_workers, settings.password_hash_max_pending
+)
@@ -0,0 +1 @@
+"""API latency benchmarks; see `python -m benchmarks.run --help`."""
@@ -0,0 +1,406 @@
+"""
+Latency benchmark for the read-heavy API routes.
+
+Seeds a scratch SQLite database (or `--database-url`) at the requested
+scale, then measures every route in two modes:
+
+- `inprocess`: the ASGI app through Starlette's TestClient, one request at
+  a time, so latencies exclude the network and the server's event loop;
+- `uvicorn`: a real server in a subprocess driven by `--concurrency`
+  concurrent httpx clients.
+
+For each route it reports p50/p95/p99/mean latency, throughput, SQL
+statements per request (from the `Server-Timing` header) and the peak RSS
+of the process serving requests so far. Results go to a JSON file that can
+be diffed across commits. Run from `backend/` (needs `httpx`):
+
+    python -m benchmarks.run --questions 5000 --output benchmark-results.json
+    python -m benchmarks.run --mode uvicorn --concurrency 16 --routes list_answers
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import re
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# `app` (and `.seed`, which imports it) read settings at import time, so
+# they are imported inside functions, after `_configure_environment`.
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+STATEMENTS = re.compile(r'desc="(\d+) statements"')
+SCALE_OPTIONS = ("clients", "experts", "questions", "answers_per_question", "popular_answers", "seed")
+
+
+@dataclass
+class Route:
+    name: str
+    path: str
+    auth: Optional[str] = None  # "client" or "expert"
+
+
+@dataclass
+class RouteResult:
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    throughput_rps: float
+    sql_statements: Optional[float]
+    peak_rss_kib: Optional[int]
+
+
+def _percentile(ordered: List[float], percent: float) -> float:
+    # Nearest rank, so p99 of 100 samples is the slowest one but one.
+    index = max(0, math.ceil(percent / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def _summarize(
+    latencies: List[float],
+    statements: List[int],
+    errors: int,
+    elapsed: float,
+    peak_rss_kib: Optional[int],
+) -> RouteResult:
+    ordered = sorted(latencies)
+    return RouteResult(
+        requests=len(latencies),
+        errors=errors,
+        p50_ms=round(_percentile(ordered, 50) * 1000, 3),
+        p95_ms=round(_percentile(ordered, 95) * 1000, 3),
+        p99_ms=round(_percentile(ordered, 99) * 1000, 3),
+        mean_ms=round(sum(ordered) / len(ordered) * 1000, 3),
+        throughput_rps=round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        sql_statements=round(sum(statements) / len(statements), 2) if statements else None,
+        peak_rss_kib=peak_rss_kib,
+    )
+
+
+def _statements(server_timing: Optional[str]) -> Optional[int]:
+    match = STATEMENTS.search(server_timing or "")
+    return int(match.group(1)) if match else None
+
+
+def _configure_environment(args: argparse.Namespace) -> Dict[str, str]:
+    """Settings for the app under test; must run before `app` is imported."""
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite:///{tempfile.mkdtemp(prefix='skillgig-bench-')}/bench.db"
+    overrides = {
+        "APP_DATABASE_URL": database_url,
+        "APP_ENVIRONMENT": "benchmark",
+        "APP_SECRET_KEY": "benchmark-secret",
+        "APP_CACHE_BACKEND": args.cache,
+        "APP_METRICS_ENABLED": "true",
+        "APP_COUNTERS_RECONCILE_SECONDS": "0",
+        # Sign-in is not what is measured; keep the logins cheap.
+        "APP_BCRYPT_ROUNDS": "4",
+        "APP_PASSWORD_HASH_WORKERS": "0",
+    }
+    os.environ.update(overrides)
+    return overrides
+
+
+def _routes(seeded, first_page_cursor: Optional[str]) -> List[Route]:
+    popular = seeded.popular_question_id
+    some = seeded.question_ids[len(seeded.question_ids) // 2]
+    routes = [
+        Route("list_questions", "/questions/?limit=20"),
+        Route("list_questions_100", "/questions/?limit=100"),
+        Route("list_questions_category", "/questions/?category=DevOps&limit=20"),
+        Route("list_questions_tags", "/questions/?tags=python&tags=docker&limit=20"),
+        Route("get_question", f"/questions/{some}"),
+        Route("list_answers", f"/questions/{some}/answers"),
+        Route("list_answers_popular", f"/questions/{popular}/answers"),
+        Route("search", "/questions/search?q=python+cache"),
+        Route("tags", "/tags?prefix=py"),
+        Route("popular_tags", "/tags/popular"),
+        Route("experts", "/users/experts"),
+        Route("my_questions", "/users/me/questions", auth="client"),
+        Route("my_answers", "/users/me/answers", auth="expert"),
+        Route("stats", "/stats"),
+        Route("categories", "/categories"),
+    ]
+    if first_page_cursor:
+        routes.insert(1, Route("list_questions_cursor", f"/questions/?limit=20&cursor={first_page_cursor}"))
+    return routes
+
+
+def _login(post: Callable, email: str) -> Dict[str, str]:
+    from .seed import PASSWORD
+
+    response = post("/auth/login", data={"username": email, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['accessToken']}"}
+
+
+def _peak_rss_self() -> int:
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _peak_rss_pid(pid: int) -> Optional[int]:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+# Modes ----------------------------------------------------------------
+
+
+def run_inprocess(args, api_prefix: str, seeded) -> Dict[str, Dict]:
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from .seed import CLIENT_EMAIL, EXPERT_EMAIL
+
+    results: Dict[str, Dict] = {}
+    with TestClient(app) as client:
+        def post(path, **kwargs):
+            return client.post(api_prefix + path, **kwargs)
+
+        auth = {"client": _login(post, CLIENT_EMAIL), "expert": _login(post, EXPERT_EMAIL)}
+        first_page = client.get(api_prefix + "/questions/?limit=20").json()
+        for route in _selected(args, _routes(seeded, first_page.get("nextCursor"))):
+            url = api_prefix + route.path
+            headers = auth.get(route.auth, {})
+            for _ in range(args.warmup):
+                client.get(url, headers=headers)
+
+            latencies, statements, errors = [], [], 0
+            started = time.perf_counter()
+            for _ in range(args.requests):
+                sent = time.perf_counter()
+                response = client.get(url, headers=headers)
+                latencies.append(time.perf_counter() - sent)
+                errors += response.status_code >= 400
+                count = _statements(response.headers.get("server-timing"))
+                if count is not None:
+                    statements.append(count)
+            elapsed = time.perf_counter() - started
+            results[route.name] = asdict(
+                _summarize(latencies, statements, errors, elapsed, _peak_rss_self())
+            )
+            _report("inprocess", route.name, results[route.name])
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit("uvicorn exited during startup")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise SystemExit("uvicorn did not start within 30s")
+
+
+async def _drive(client, url: str, headers: Dict[str, str], total: int, concurrency: int):
+    latencies: List[float] = []
+    statements: List[int] = []
+    errors = 0
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            sent = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            latencies.append(time.perf_counter() - sent)
+            errors += response.status_code >= 400
+            count = _statements(response.headers.get("server-timing"))
+            if count is not None:
+                statements.append(count)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statements, errors, time.perf_counter() - started
+
+
+async def _run_uvicorn(args, base_url: str, seeded, pid: int) -> Dict[str, Dict]:
+    import httpx
+
+    from .seed import CLIENT_EMAIL, EXPERT_EMAIL, PASSWORD
+
+    results: Dict[str, Dict] = {}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        auth = {}
+        for role, email in (("client", CLIENT_EMAIL), ("expert", EXPERT_EMAIL)):
+            response = await client.post(
+                "/auth/login", data={"username": email, "password": PASSWORD}
+            )
+            response.raise_for_status()
+            auth[role] = {"Authorization": f"Bearer {response.json()['accessToken']}"}
+        first_page = (await client.get("/questions/?limit=20")).json()
+
+        for route in _selected(args, _routes(seeded, first_page.get("nextCursor"))):
+            headers = auth.get(route.auth, {})
+            await _drive(client, route.path, headers, args.warmup, args.concurrency)
+            latencies, statements, errors, elapsed = await _drive(
+                client, route.path, headers, args.requests, args.concurrency
+            )
+            results[route.name] = asdict(
+                _summarize(latencies, statements, errors, elapsed, _peak_rss_pid(pid))
+            )
+            _report("uvicorn", route.name, results[route.name])
+    return results
+
+
+def run_uvicorn(args, api_prefix: str, seeded) -> Dict[str, Dict]:
+    port = _free_port()
+    server = _start_server(port)
+    try:
+        return asyncio.run(
+            _run_uvicorn(args, f"http://127.0.0.1:{port}{api_prefix}", seeded, server.pid)
+        )
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+# CLI ------------------------------------------------------------------
+
+
+def _selected(args, routes: List[Route]) -> List[Route]:
+    if not args.routes:
+        return routes
+    return [route for route in routes if route.name in args.routes]
+
+
+def _report(mode: str, name: str, result: Dict) -> None:
+    print(
+        f"{mode:<9} {name:<26} p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+        f"p99 {result['p99_ms']:>8.2f} ms  {result['throughput_rps']:>8.1f} req/s  "
+        f"sql {result['sql_statements']}  errors {result['errors']}",
+        flush=True,
+    )
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    scale = parser.add_argument_group("data scale", "defaults come from benchmarks.seed.Scale")
+    for option in SCALE_OPTIONS:
+        scale.add_argument("--" + option.replace("_", "-"), type=int)
+    parser.add_argument("--database-url", help="seed this (empty) database instead of a scratch SQLite file")
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn", "both"], default="both")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per route")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per route")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients in uvicorn mode")
+    parser.add_argument("--cache", choices=["none", "memory"], default="none", help="response cache backend")
+    parser.add_argument("--routes", nargs="*", help="only these route names")
+    parser.add_argument("--output", default="benchmark-results.json")
+    args = parser.parse_args(argv)
+    for option, least in (("clients", 1), ("experts", 1), ("questions", 2)):
+        value = getattr(args, option)
+        if value is not None and value < least:
+            parser.error(f"--{option} must be at least {least}")
+    return args
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    environment = _configure_environment(args)
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from app.core.config import get_settings
+    from app.database import engine
+    from app.migrations import run_startup_migrations
+    from .seed import Scale, seed
+
+    scale = Scale(
+        **{option: getattr(args, option) for option in SCALE_OPTIONS if getattr(args, option) is not None}
+    )
+    run_startup_migrations(engine)
+    seeding_started = time.perf_counter()
+    seeded = seed(engine, scale)
+    seeding_seconds = time.perf_counter() - seeding_started
+    print(f"seeded {seeded.rows} in {seeding_seconds:.1f}s", flush=True)
+
+    api_prefix = get_settings().api_prefix
+    results: Dict[str, Dict[str, Dict]] = {}
+    if args.mode in ("inprocess", "both"):
+        results["inprocess"] = run_inprocess(args, api_prefix, seeded)
+    if args.mode in ("uvicorn", "both"):
+        results["uvicorn"] = run_uvicorn(args, api_prefix, seeded)
+
+    import fastapi
+    import pydantic
+    import sqlalchemy
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "versions": {
+                "fastapi": fastapi.__version__,
+                "pydantic": pydantic.VERSION,
+                "sqlalchemy": sqlalchemy.__version__,
+            },
+            "database": engine.dialect.name,
+            "scale": asdict(scale),
+            "rows": seeded.rows,
+            "seeding_seconds": round(seeding_seconds, 2),
+            "requests_per_route": args.requests,
+            "warmup_per_route": args.warmup,
+            "concurrency": args.concurrency,
+            "cache_backend": environment["APP_CACHE_BACKEND"],
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(f"wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,177 @@
+"""
+Synthetic data for benchmarks.
+
+Rows are built from a seeded RNG (same scale and seed, same database) and
+inserted in bulk through the ORM models; denormalized counts are written
+with the rows and the counter tables are rebuilt by `reconcile_all`.
+"""
+
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.engine import Engine
+
+from app.counters import reconcile_all
+from app.models import Answer, ExpertProfile, Question, QuestionTag, User
+from app.routers.categories import CATEGORY_SEED
+from app.utils.security import get_password_hash
+
+PASSWORD = "benchmark-password"
+CLIENT_EMAIL = "client0@example.com"
+EXPERT_EMAIL = "expert0@example.com"
+INSERT_CHUNK_SIZE = 1000
+
+WORDS = (
+    "python vue react sqlite postgres docker kubernetes redis cache index query "
+    "async thread deploy api auth token session migration test build css layout "
+    "render model train tensor gradient mobile swift kotlin flutter security"
+).split()
+
+
+@dataclass
+class Scale:
+    clients: int = 200
+    experts: int = 50
+    questions: int = 2000
+    answers_per_question: int = 5
+    # One question gets this many answers to exercise long answer lists.
+    popular_answers: int = 300
+    seed: int = 1
+
+
+@dataclass
+class Seeded:
+    popular_question_id: str
+    question_ids: List[str] = field(default_factory=list)
+    rows: Dict[str, int] = field(default_factory=dict)
+
+
+def _insert(engine: Engine, model, rows: List[Dict[str, Any]]) -> None:
+    with engine.begin() as conn:
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            conn.execute(insert(model), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def seed(engine: Engine, scale: Scale) -> Seeded:
+    """Insert users, expert profiles, tagged questions and answers at `scale` (at least one client and one expert)."""
+    rng = random.Random(scale.seed)
+
+    def new_id() -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    hashed_password = get_password_hash(PASSWORD)
+    start = datetime(2024, 1, 1)
+
+    users: List[Dict[str, Any]] = []
+    profiles: List[Dict[str, Any]] = []
+    for role, count in (("client", scale.clients), ("expert", scale.experts)):
+        for index in range(count):
+            user_id = new_id()
+            users.append(
+                {
+                    "id": user_id,
+                    "email": f"{role}{index}@example.com",
+                    "username": f"{role}{index}",
+                    "first_name": role.title(),
+                    "last_name": str(index),
+                    "role": role,
+                    "hashed_password": hashed_password,
+                    "is_active": True,
+                    "created_at": start + timedelta(minutes=len(users)),
+                    "answers_count": 0,
+                }
+            )
+            if role == "expert":
+                profiles.append(
+                    {
+                        "user_id": user_id,
+                        "full_name": f"Expert {index}",
+                        "primary_role": "expert",
+                        "skills": rng.sample(WORDS, 3),
+                        "experience_years": rng.randint(0, 15),
+                        "average_rating": rng.randint(0, 5),
+                        "resolved_questions": 0,
+                    }
+                )
+    clients = users[: scale.clients]
+    experts = users[scale.clients:]
+    expert_profiles = {row["user_id"]: row for row in profiles}
+
+    questions: List[Dict[str, Any]] = []
+    question_tags: List[Dict[str, Any]] = []
+    answers: List[Dict[str, Any]] = []
+    accepted: List[Dict[str, Any]] = []
+    for index in range(scale.questions):
+        question_id = new_id()
+        created_at = start + timedelta(hours=1, seconds=37 * index)
+        tags = rng.sample(WORDS, rng.randint(1, 4))
+        client = clients[index % len(clients)]
+        count = scale.popular_answers if index == 0 else scale.answers_per_question
+        resolved = count > 0 and rng.random() < 0.3
+        questions.append(
+            {
+                "id": question_id,
+                "title": " ".join(rng.sample(WORDS, 6)).capitalize(),
+                "description": " ".join(rng.choices(WORDS, k=60)),
+                "category": CATEGORY_SEED[index % len(CATEGORY_SEED)]["name"],
+                "difficulty": rng.choice(["beginner", "intermediate", "advanced"]),
+                "tags": tags,
+                "links": [],
+                "status": "resolved" if resolved else "published",
+                "client_id": client["id"],
+                "answers_count": count,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+        question_tags += [{"question_id": question_id, "tag": tag} for tag in tags]
+
+        for position in range(count):
+            author = rng.choice(experts)
+            author["answers_count"] += 1
+            answer = {
+                "id": new_id(),
+                "question_id": question_id,
+                "author_id": author["id"],
+                "answer_text": " ".join(rng.choices(WORDS, k=40)),
+                "links": [],
+                "expert_name": f"{author['first_name']} {author['last_name']}",
+                "expert_rating": float(expert_profiles[author["id"]]["average_rating"]),
+                "is_accepted": resolved and position == 0,
+                "created_at": created_at + timedelta(minutes=position + 1),
+            }
+            answers.append(answer)
+            if answer["is_accepted"]:
+                expert_profiles[author["id"]]["resolved_questions"] += 1
+                accepted.append({"question": question_id, "answer": answer["id"]})
+
+    _insert(engine, User, users)
+    _insert(engine, ExpertProfile, profiles)
+    _insert(engine, Question, questions)
+    _insert(engine, QuestionTag, question_tags)
+    _insert(engine, Answer, answers)
+    if accepted:
+        with engine.begin() as conn:
+            conn.execute(
+                update(Question.__table__)
+                .where(Question.__table__.c.id == bindparam("question"))
+                .values(accepted_answer_id=bindparam("answer")),
+                accepted,
+            )
+    reconcile_all(engine)
+
+    return Seeded(
+        popular_question_id=questions[0]["id"],
+        question_ids=[row["id"] for row in questions],
+        rows={
+            "users": len(users),
+            "expert_profiles": len(profiles),
+            "questions": len(questions),
+            "question_tags": len(question_tags),
+            "answers": len(answers),
+        },
+    )
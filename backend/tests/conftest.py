@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings and engines are read at import time: point them at a scratch
+# database before the app is imported.
+_scratch = tempfile.mkdtemp(prefix="skillgig-tests-")
+os.environ["APP_DATABASE_URL"] = f"sqlite:///{_scratch}/app.db"
+os.environ.setdefault("APP_ENVIRONMENT", "test")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+API = "/api/v1"
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def register(client):
+    """Register a user and return (auth headers, user id)."""
+
+    def _register(role: str = "client"):
+        username = f"{role}-{os.urandom(4).hex()}"
+        email = f"{username}@example.com"
+        response = client.post(
+            f"{API}/auth/register",
+            json={"email": email, "username": username, "password": "pw123456", "role": role},
+        )
+        assert response.status_code == 201, response.text
+        response = client.post(
+            f"{API}/auth/login", data={"username": email, "password": "pw123456"}
+        )
+        assert response.status_code == 200, response.text
+        body = response.json()
+        return {"Authorization": f"Bearer {body['accessToken']}"}, body["user"]["id"]
+
+    return _register
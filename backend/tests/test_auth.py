@@ -0,0 +1,63 @@
+import asyncio
+
+from passlib.hash import bcrypt
+
+from app.database import SessionLocal
+from app.models import User
+from app.utils.passwords import PasswordHasher, password_hasher
+
+from .conftest import API
+
+
+def _login(client, username):
+    return client.post(f"{API}/auth/login", data={"username": username, "password": "pw123456"})
+
+
+def _stored_hash(user_id):
+    with SessionLocal() as db:
+        return db.get(User, user_id).hashed_password
+
+
+def test_login_upgrades_a_cheaper_hash(client, register):
+    _, user_id = register("client")
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        user.hashed_password = bcrypt.using(rounds=4).hash("pw123456")
+        username = user.username
+        db.commit()
+
+    assert _login(client, username).status_code == 200
+    upgraded = _stored_hash(user_id)
+    assert not upgraded.startswith("$2b$04$")
+    assert bcrypt.verify("pw123456", upgraded)
+
+    assert _login(client, username).status_code == 200
+    assert _stored_hash(user_id) == upgraded
+
+
+def test_sign_ins_beyond_the_pending_limit_get_503(client, register, monkeypatch):
+    _, user_id = register("client")
+    with SessionLocal() as db:
+        username = db.get(User, user_id).username
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    response = _login(client, username)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_process_pool_hashes_and_verifies():
+    hasher = PasswordHasher(workers=1, max_pending=4)
+
+    async def roundtrip():
+        hashed = await hasher.hash("secret")
+        return hashed, await hasher.verify_and_update("secret", hashed)
+
+    try:
+        hashed, (valid, new_hash) = asyncio.run(roundtrip())
+        # Never forked from the (threaded) server process.
+        assert hasher._executor._mp_context.get_start_method() != "fork"
+    finally:
+        hasher.shutdown()
+    assert valid and new_hash is None
+    assert bcrypt.verify("secret", hashed)
@@ -0,0 +1,65 @@
+import pytest
+from jose import JWTError
+
+from app import auth_cache
+from app.auth_cache import access_token_claims, claims_cache, user_cache
+from app.database import SessionLocal
+from app.models import User
+
+from .conftest import API
+
+
+def _token(headers):
+    return headers["Authorization"].split(" ", 1)[1]
+
+
+def test_verified_claims_are_reused(register, monkeypatch):
+    headers, user_id = register("client")
+    claims_cache.clear()
+    calls = []
+    decode = auth_cache.decode_token
+
+    def counting_decode(token, expected_type):
+        calls.append(token)
+        return decode(token, expected_type=expected_type)
+
+    monkeypatch.setattr(auth_cache, "decode_token", counting_decode)
+    token = _token(headers)
+    assert access_token_claims(token)["sub"] == user_id
+    assert access_token_claims(token)["sub"] == user_id
+    assert len(calls) == 1
+
+    with pytest.raises(JWTError):
+        access_token_claims("not-a-token")
+    with pytest.raises(JWTError):
+        access_token_claims("not-a-token")
+    assert calls.count("not-a-token") == 2
+
+
+def test_user_snapshot_is_dropped_on_commit(client, register):
+    headers, user_id = register("client")
+    assert client.get(f"{API}/users/me", headers=headers).status_code == 200
+    assert user_cache.get(user_id) is not None
+
+    # A rolled back change keeps the snapshot.
+    with SessionLocal() as db:
+        db.get(User, user_id).first_name = "Rolled"
+        db.flush()
+        db.rollback()
+    assert user_cache.get(user_id) is not None
+
+    # Creating the profile leaves the user's columns alone; editing it drops them.
+    client.put(f"{API}/users/me/profile", json={"bio": "first"}, headers=headers)
+    client.get(f"{API}/users/me", headers=headers)
+    assert user_cache.get(user_id) is not None
+    response = client.put(f"{API}/users/me/profile", json={"bio": "second"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert user_cache.get(user_id) is None
+
+    client.get(f"{API}/users/me", headers=headers)
+    assert user_cache.get(user_id) is not None
+    with SessionLocal() as db:
+        db.get(User, user_id).is_active = False
+        db.commit()
+    assert user_cache.get(user_id) is None
+    assert client.get(f"{API}/users/me", headers=headers).status_code == 400
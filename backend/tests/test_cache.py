@@ -0,0 +1,29 @@
+from app.cache import MemoryBackend, ResponseCache
+
+
+def test_replica_reads_are_not_cached_right_after_a_write():
+    cache = ResponseCache(MemoryBackend(), ttl_seconds=60, replica_lag_seconds=5)
+    cache.store("fresh", b"{}", ["question:1"], generation=cache.generation(), replica=True)
+    assert cache.get("fresh") is not None
+
+    cache.invalidate("question:1")
+    cache.store("replica", b"{}", ["question:1"], generation=cache.generation(), replica=True)
+    cache.store("primary", b"{}", ["question:1"], generation=cache.generation())
+    assert cache.get("replica") is None
+    assert cache.get("primary") is not None
+
+    cache.backend._invalidated_at -= 5
+    cache.store("replica", b"{}", ["question:1"], generation=cache.generation(), replica=True)
+    assert cache.get("replica") is not None
+
+
+def test_pages_read_before_an_invalidation_are_not_cached():
+    cache = ResponseCache(MemoryBackend(), ttl_seconds=60)
+    generation = cache.generation()
+    # Another request writes and invalidates while this one is querying.
+    cache.invalidate("questions")
+    cache.store("page", b"{}", ["questions"], generation=generation)
+    assert cache.get("page") is None
+
+    cache.store("page", b"{}", ["questions"], generation=cache.generation())
+    assert cache.get("page") is not None
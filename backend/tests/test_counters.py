@@ -0,0 +1,73 @@
+import os
+
+from sqlalchemy import func, select
+
+from app.counters import QUESTIONS_TOTAL, USERS_TOTAL, category_key, reconcile_all, status_key
+from app.database import SessionLocal, engine
+from app.models import Counter, Question, User
+
+from .conftest import API
+
+
+def _counters():
+    with SessionLocal() as db:
+        return dict(db.execute(select(Counter.key, Counter.value)).all())
+
+
+def _changes(before, after, *keys):
+    return {key: after.get(key, 0) - before.get(key, 0) for key in keys}
+
+
+def test_counters_follow_question_writes(client, register):
+    before = _counters()
+    headers, _ = register("client")
+    after_register = _counters()
+    assert _changes(before, after_register, USERS_TOTAL) == {USERS_TOTAL: 1}
+
+    # Categories of their own, so other tests' questions don't show up here.
+    old_category, new_category = f"Old-{os.urandom(3).hex()}", f"New-{os.urandom(3).hex()}"
+    keys = (
+        QUESTIONS_TOTAL,
+        status_key("published"),
+        status_key("resolved"),
+        category_key(old_category),
+        category_key(new_category),
+    )
+    response = client.post(
+        f"{API}/questions/",
+        json={"title": "Count", "description": "d", "category": old_category, "status": "published"},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    question_id = response.json()["id"]
+    created = _counters()
+    assert _changes(after_register, created, *keys) == dict(zip(keys, [1, 1, 0, 1, 0]))
+
+    response = client.put(
+        f"{API}/questions/{question_id}",
+        json={"status": "resolved", "category": new_category},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    moved = _counters()
+    assert _changes(created, moved, *keys) == dict(zip(keys, [0, -1, 1, -1, 1]))
+
+    assert client.delete(f"{API}/questions/{question_id}", headers=headers).status_code == 204
+    deleted = _counters()
+    assert _changes(moved, deleted, *keys) == dict(zip(keys, [-1, 0, -1, 0, -1]))
+
+
+def test_reconciliation_rebuilds_drifted_counters(client, register):
+    register("client")
+    with SessionLocal() as db:
+        db.merge(Counter(key=QUESTIONS_TOTAL, value=-7))
+        db.merge(Counter(key=category_key("Gone"), value=3))
+        db.commit()
+
+    reconcile_all(engine)
+
+    counters = _counters()
+    with SessionLocal() as db:
+        assert counters[QUESTIONS_TOTAL] == db.scalar(select(func.count(Question.id)))
+        assert counters[USERS_TOTAL] == db.scalar(select(func.count(User.id)))
+    assert category_key("Gone") not in counters
@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+import pytest
+from starlette.requests import Request
+from starlette.websockets import WebSocketDisconnect
+
+from app.events import EventBroker, MemoryBackend, event_broker, question_topic
+from app.routers import events as events_router
+
+from .conftest import API
+
+
+def _ask(client, headers):
+    response = client.post(
+        f"{API}/questions/",
+        json={"title": "Live", "description": "d", "category": "DevOps", "status": "published"},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _wait_for_subscriber(topic):
+    # The socket subscribes after accepting; publishing earlier would be lost.
+    deadline = time.monotonic() + 5
+    while topic not in event_broker._subscribers:
+        assert time.monotonic() < deadline, "no subscriber"
+        time.sleep(0.01)
+
+
+def test_websocket_receives_answer_events(client, register):
+    owner, _ = register("client")
+    expert, _ = register("expert")
+    question_id = _ask(client, owner)
+
+    with client.websocket_connect(f"{API}/questions/{question_id}/ws") as socket:
+        _wait_for_subscriber(question_topic(question_id))
+        answer = client.post(
+            f"{API}/questions/{question_id}/answers", json={"answerText": "a"}, headers=expert
+        ).json()
+        event = socket.receive_json()
+        assert event["type"] == "answer.created"
+        assert event["answer"]["id"] == answer["id"]
+
+        client.post(
+            f"{API}/questions/{question_id}/answers/{answer['id']}/verify",
+            json={"isCorrect": True},
+            headers=owner,
+        )
+        event = socket.receive_json()
+        assert event["type"] == "answer.verified"
+        assert event["acceptedAnswerId"] == answer["id"]
+        assert event["status"] == "resolved"
+
+        client.delete(f"{API}/questions/{question_id}/answers/{answer['id']}", headers=expert)
+        event = socket.receive_json()
+        assert event == {
+            "type": "answer.deleted",
+            "questionId": question_id,
+            "answerId": answer["id"],
+            "status": "published",
+            "acceptedAnswerId": None,
+        }
+
+
+def test_unknown_questions_have_no_event_stream(client):
+    assert client.get(f"{API}/questions/missing/events").status_code == 404
+    with client.websocket_connect(f"{API}/questions/missing/ws") as socket:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            socket.receive_text()
+    assert closed.value.code == 4404
+
+
+def test_sse_stream_sends_events_and_heartbeats(monkeypatch):
+    async def exists(factory, question_id):
+        return True
+
+    broker = EventBroker(MemoryBackend(), max_pending=10)
+    monkeypatch.setattr(events_router, "_question_exists", exists)
+    monkeypatch.setattr(events_router, "event_broker", broker)
+    monkeypatch.setattr(events_router.settings, "events_heartbeat_seconds", 0.05)
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+    async def read():
+        response = await events_router.question_events("q1", request)
+        assert response.media_type == "text/event-stream"
+        body = response.body_iterator
+        chunks = [await body.__anext__()]
+        broker.publish(question_topic("q1"), "answer.created", {"answerId": "a1"})
+        chunks.append(await body.__anext__())
+        chunks.append(await body.__anext__())
+        await body.aclose()
+        return chunks
+
+    chunks = asyncio.run(read())
+    assert chunks == [
+        b"retry: 3000\n\n",
+        b'data: {"type":"answer.created","answerId":"a1"}\n\n',
+        b": keep-alive\n\n",
+    ]
+    assert broker._subscribers == {}
+
+
+def test_subscribers_that_fall_behind_are_cut_off():
+    broker = EventBroker(MemoryBackend(), max_pending=2)
+
+    async def overflow():
+        async with broker.subscribe("topic") as subscription:
+            for n in range(4):
+                broker.publish("topic", "tick", {"n": n})
+            await asyncio.sleep(0)
+            return [await subscription.get(1) for _ in range(3)]
+
+    assert asyncio.run(overflow()) == [b'{"type":"tick","n":0}', b'{"type":"tick","n":1}', None]
@@ -0,0 +1,63 @@
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+
+from app.database import engine
+
+from .conftest import API
+
+
+@contextmanager
+def statements():
+    executed: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _set_skills(client, headers, skills):
+    response = client.put(f"{API}/users/me/profile", json={"skills": skills}, headers=headers)
+    assert response.status_code == 200, response.text
+
+
+def test_list_experts_is_one_statement_then_cached(client, register):
+    for _ in range(3):
+        headers, _ = register("expert")
+        _set_skills(client, headers, ["python"])
+
+    with statements() as executed:
+        response = client.get(f"{API}/users/experts", params={"limit": 100})
+    assert response.status_code == 200
+    assert len(response.json()) >= 3
+    assert len(executed) == 1, executed
+
+    with statements() as executed:
+        cached = client.get(f"{API}/users/experts", params={"limit": 100})
+    assert cached.content == response.content
+    assert executed == []
+
+
+def test_list_experts_matches_skill_elements(client, register):
+    headers, ascii_id = register("expert")
+    _set_skills(client, headers, ["Vue.js", "TypeScript"])
+    headers, unicode_id = register("expert")
+    _set_skills(client, headers, ["Фотошоп", "ux"])
+
+    def matching(skill):
+        response = client.get(f"{API}/users/experts", params={"skills": skill, "limit": 100})
+        assert response.status_code == 200
+        return {expert["id"] for expert in response.json()}
+
+    assert ascii_id in matching("vue.js")
+    assert ascii_id in matching("TYPESCRIPT")
+    # Whole elements only, not substrings of one.
+    assert ascii_id not in matching("script")
+    assert unicode_id in matching("Фотошоп")
+    assert unicode_id not in matching("Фото")
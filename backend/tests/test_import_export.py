@@ -0,0 +1,80 @@
+import json
+import os
+
+from app.routers import questions as questions_router
+
+from .conftest import API
+
+
+def _category():
+    # Each test exports only its own questions.
+    return f"Import-{os.urandom(3).hex()}"
+
+
+def _row(category, title, **extra):
+    return {"title": title, "description": "d", "category": category, "status": "published", **extra}
+
+
+def _export(client, headers, category):
+    response = client.get(f"{API}/questions/export", params={"category": category}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_bulk_reports_invalid_rows_and_stores_the_rest(client, register):
+    headers, _ = register("client")
+    category = _category()
+    response = client.post(
+        f"{API}/questions/bulk",
+        json=[_row(category, "first"), {"title": "no description"}, _row(category, "third")],
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["created"] == 2 and len(body["ids"]) == 2
+    assert [error["index"] for error in body["errors"]] == [1]
+
+    exported = _export(client, headers, category)
+    assert sorted(item["title"] for item in exported) == ["first", "third"]
+
+
+def test_import_streams_ndjson_and_export_returns_answers(client, register):
+    headers, _ = register("expert")
+    category = _category()
+    lines = [
+        json.dumps(_row(category, "with answers", answers=[{"answerText": "one"}, {"answerText": "two"}])),
+        "{not json",
+        "",
+        json.dumps(_row(category, "plain", tags=["Import"])),
+    ]
+    response = client.post(
+        f"{API}/questions/import",
+        content="\n".join(lines).encode(),
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["created"] == 2
+    assert body["errors"] == [{"index": 1, "detail": "Invalid JSON"}]
+
+    exported = {item["title"]: item for item in _export(client, headers, category)}
+    assert sorted(answer["answerText"] for answer in exported["with answers"]["answers"]) == ["one", "two"]
+    assert exported["with answers"]["answersCount"] == 2
+    assert exported["plain"]["tags"] == ["Import"]
+
+
+def test_import_rejects_an_overlong_line(client, register, monkeypatch):
+    monkeypatch.setattr(questions_router, "IMPORT_MAX_LINE_BYTES", 300)
+    headers, _ = register("client")
+    category = _category()
+    body = json.dumps(_row(category, "kept")) + "\n" + json.dumps(_row(category, "x" * 400))
+
+    response = client.post(f"{API}/questions/import", content=body.encode(), headers=headers)
+    assert response.status_code == 413
+    assert "Line 1" in response.json()["detail"]
+    assert [item["title"] for item in _export(client, headers, category)] == ["kept"]
+
+    # No newline at all: the buffered line is cut off at the limit too.
+    response = client.post(f"{API}/questions/import", content=b"x" * 1000, headers=headers)
+    assert response.status_code == 413
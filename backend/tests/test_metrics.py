@@ -0,0 +1,30 @@
+from app.core.config import get_settings
+
+from .conftest import API
+
+settings = get_settings()
+
+
+def test_metrics_need_the_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", None)
+    monkeypatch.setattr(settings, "environment", "production")
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "metrics_token", "s3cret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "skillgig_http_requests_total" in response.text
+
+
+def test_routes_are_labelled_by_their_template(client, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "s3cret")
+    # A parameter value equal to a literal segment of the path.
+    client.get(f"{API}/questions/questions")
+    client.get(f"{API}/no-such-route")
+
+    text = client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).text
+    assert f'route="{API}/questions/{{question_id}}",status="404"' in text
+    assert 'route="unmatched",status="404"' in text
+    assert "/questions/questions" not in text
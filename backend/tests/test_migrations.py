@@ -0,0 +1,163 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from app import migrations
+from app.migrations import LATEST_VERSION, run_startup_migrations
+
+# Schema of a database created before versioned migrations existed.
+BASELINE_SCHEMA = [
+    """
+    CREATE TABLE users (
+        id VARCHAR NOT NULL PRIMARY KEY, email VARCHAR NOT NULL, username VARCHAR,
+        first_name VARCHAR, last_name VARCHAR, role VARCHAR NOT NULL,
+        hashed_password VARCHAR NOT NULL, is_active BOOLEAN,
+        created_at DATETIME NOT NULL, updated_at DATETIME
+    )
+    """,
+    "CREATE UNIQUE INDEX ix_users_email ON users (email)",
+    "CREATE UNIQUE INDEX ix_users_username ON users (username)",
+    """
+    CREATE TABLE questions (
+        id VARCHAR NOT NULL PRIMARY KEY, title VARCHAR(255) NOT NULL,
+        description TEXT NOT NULL, category VARCHAR(100) NOT NULL,
+        subcategory VARCHAR(100), difficulty VARCHAR(50), tags JSON, links JSON,
+        code_example TEXT, deadline DATETIME, status VARCHAR(50) NOT NULL,
+        client_id VARCHAR NOT NULL REFERENCES users (id),
+        accepted_answer_id VARCHAR REFERENCES answers (id),
+        created_at DATETIME NOT NULL, updated_at DATETIME
+    )
+    """,
+    """
+    CREATE TABLE answers (
+        id VARCHAR NOT NULL PRIMARY KEY,
+        question_id VARCHAR NOT NULL REFERENCES questions (id),
+        author_id VARCHAR NOT NULL REFERENCES users (id),
+        answer_text TEXT NOT NULL, code_example TEXT, links JSON,
+        expert_name VARCHAR(255), expert_rating FLOAT, is_accepted BOOLEAN,
+        created_at DATETIME NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE expert_profiles (
+        id INTEGER NOT NULL PRIMARY KEY, user_id VARCHAR NOT NULL UNIQUE REFERENCES users (id),
+        full_name VARCHAR, bio VARCHAR, primary_role VARCHAR, skills JSON,
+        github_url VARCHAR, linkedin_url VARCHAR, portfolio_url VARCHAR,
+        experience_years INTEGER, average_rating INTEGER, resolved_questions INTEGER
+    )
+    """,
+]
+
+NOW = "2024-01-01 00:00:00"
+
+
+@pytest.fixture
+def baseline_engine(tmp_path, monkeypatch):
+    # Small batches so the backfills take more than one round.
+    monkeypatch.setattr(migrations, "BATCH_SIZE", 2)
+    engine = create_engine(f"sqlite:///{tmp_path}/baseline.db")
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA:
+            conn.execute(text(statement))
+        for user in ("u1", "u2"):
+            conn.execute(
+                text(
+                    "INSERT INTO users (id, email, role, hashed_password, is_active, created_at)"
+                    " VALUES (:id, :id || '@example.com', 'expert', 'x', 1, :now)"
+                ),
+                {"id": user, "now": NOW},
+            )
+        questions = [
+            ("q1", "Docker volumes", ["Docker", " docker ", "Linux"], "published"),
+            ("q2", "Vue refs", ["Vue"], "resolved"),
+            ("q3", "Untagged", None, "draft"),
+        ]
+        for question_id, title, tags, status in questions:
+            conn.execute(
+                text(
+                    "INSERT INTO questions (id, title, description, category, tags, status,"
+                    " client_id, created_at) VALUES (:id, :title, 'd', 'DevOps', :tags,"
+                    " :status, 'u1', :now)"
+                ),
+                {"id": question_id, "title": title, "tags": json.dumps(tags), "status": status, "now": NOW},
+            )
+        for answer_id, question_id, author, accepted in [
+            ("a1", "q1", "u2", None),
+            ("a2", "q1", "u2", 1),
+            ("a3", "q1", "u1", 0),
+            ("a4", "q2", "u2", None),
+        ]:
+            conn.execute(
+                text(
+                    "INSERT INTO answers (id, question_id, author_id, answer_text, is_accepted,"
+                    " created_at) VALUES (:id, :question, :author, 'mount a named volume',"
+                    " :accepted, :now)"
+                ),
+                {"id": answer_id, "question": question_id, "author": author, "accepted": accepted, "now": NOW},
+            )
+    yield engine
+    engine.dispose()
+
+
+def _rows(conn, sql):
+    return conn.execute(text(sql)).all()
+
+
+def test_baseline_database_is_migrated_and_backfilled(baseline_engine):
+    run_startup_migrations(baseline_engine)
+
+    with baseline_engine.connect() as conn:
+        assert _rows(conn, "SELECT max(version) FROM schema_migrations") == [(LATEST_VERSION,)]
+        assert _rows(conn, "SELECT id, answers_count FROM questions ORDER BY id") == [
+            ("q1", 3), ("q2", 1), ("q3", 0)
+        ]
+        assert _rows(conn, "SELECT id, answers_count FROM users ORDER BY id") == [("u1", 1), ("u2", 3)]
+        assert _rows(conn, "SELECT question_id, tag FROM question_tags ORDER BY 1, 2") == [
+            ("q1", "docker"), ("q1", "linux"), ("q2", "vue")
+        ]
+        assert _rows(conn, "SELECT name, questions_count FROM tags ORDER BY name") == [
+            ("docker", 1), ("linux", 1), ("vue", 1)
+        ]
+        counters = dict(_rows(conn, "SELECT key, value FROM counters"))
+        assert counters["questions:total"] == 3
+        assert counters["users:total"] == 2
+        assert counters["questions:status:published"] == 1
+        assert counters["questions:category:DevOps"] == 3
+        assert _rows(conn, "SELECT count(*) FROM answers WHERE is_accepted IS NULL") == [(0,)]
+        matches = _rows(
+            conn,
+            "SELECT d.question_id FROM questions_fts f"
+            " JOIN questions_fts_docs d ON d.docid = f.rowid"
+            " WHERE questions_fts MATCH 'volume' ORDER BY 1",
+        )
+        assert matches == [("q1",), ("q2",)]
+
+
+def test_a_current_database_costs_one_query(baseline_engine):
+    run_startup_migrations(baseline_engine)
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(baseline_engine, "before_cursor_execute", record)
+    try:
+        run_startup_migrations(baseline_engine)
+    finally:
+        event.remove(baseline_engine, "before_cursor_execute", record)
+    assert len(statements) == 1
+    assert "schema_migrations" in statements[0]
+
+
+def test_an_interrupted_run_resumes_at_the_next_step(baseline_engine, monkeypatch):
+    steps = migrations.MIGRATIONS
+    monkeypatch.setattr(migrations, "MIGRATIONS", steps[:5])
+    run_startup_migrations(baseline_engine)
+    monkeypatch.setattr(migrations, "MIGRATIONS", steps)
+    run_startup_migrations(baseline_engine)
+
+    with baseline_engine.connect() as conn:
+        versions = [row[0] for row in _rows(conn, "SELECT version FROM schema_migrations ORDER BY 1")]
+        assert versions == [version for version, _, _ in steps]
+        assert _rows(conn, "SELECT count(*) FROM question_tags") == [(3,)]
@@ -0,0 +1,94 @@
+from app.database import SessionLocal
+from app.models import Answer, ExpertProfile, Question
+
+from .conftest import API
+
+
+def _ask(client, headers):
+    response = client.post(
+        f"{API}/questions/",
+        json={"title": "Verify", "description": "d", "category": "DevOps", "status": "published"},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _answer(client, question_id, headers):
+    response = client.post(
+        f"{API}/questions/{question_id}/answers", json={"answerText": "a"}, headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _verify(client, question_id, answer_id, headers, is_correct=True):
+    return client.post(
+        f"{API}/questions/{question_id}/answers/{answer_id}/verify",
+        json={"isCorrect": is_correct},
+        headers=headers,
+    )
+
+
+def _state(question_id, *experts):
+    """(status, accepted_answer_id, accepted answer ids, resolved count per expert)."""
+    with SessionLocal() as db:
+        question = db.get(Question, question_id)
+        accepted = {
+            answer.id
+            for answer in db.query(Answer).filter(Answer.question_id == question_id)
+            if answer.is_accepted
+        }
+        # A profile is only created when one of the expert's answers is accepted.
+        profiles = {
+            profile.user_id: profile.resolved_questions
+            for profile in db.query(ExpertProfile).filter(ExpertProfile.user_id.in_(experts))
+        }
+        resolved = [profiles.get(expert, 0) for expert in experts]
+        return question.status, question.accepted_answer_id, accepted, resolved
+
+
+def test_verifying_and_unverifying_answers_keeps_counters_in_step(client, register):
+    owner, _ = register("client")
+    expert_a, a_id = register("expert")
+    expert_b, b_id = register("expert")
+    question_id = _ask(client, owner)
+    a1 = _answer(client, question_id, expert_a)
+    b1 = _answer(client, question_id, expert_b)
+    a2 = _answer(client, question_id, expert_a)
+
+    response = _verify(client, question_id, a1, owner)
+    assert response.status_code == 200, response.text
+    assert response.json()["isAccepted"] is True
+    assert _state(question_id, a_id, b_id) == ("resolved", a1, {a1}, [1, 0])
+
+    # Another author's answer is accepted alongside and becomes the current one.
+    _verify(client, question_id, b1, owner)
+    assert _state(question_id, a_id, b_id) == ("resolved", b1, {a1, b1}, [1, 1])
+
+    # Switching within one author moves the flag, not the author's count.
+    _verify(client, question_id, a2, owner)
+    assert _state(question_id, a_id, b_id) == ("resolved", a2, {b1, a2}, [1, 1])
+
+    # Unverifying the current answer falls back to the remaining accepted one.
+    response = _verify(client, question_id, a2, owner, is_correct=False)
+    assert response.json()["isAccepted"] is False
+    assert _state(question_id, a_id, b_id) == ("resolved", b1, {b1}, [0, 1])
+
+    _verify(client, question_id, b1, owner, is_correct=False)
+    assert _state(question_id, a_id, b_id) == ("published", None, set(), [0, 0])
+
+    # Repeating it changes nothing and never drives the count below zero.
+    _verify(client, question_id, b1, owner, is_correct=False)
+    assert _state(question_id, a_id, b_id) == ("published", None, set(), [0, 0])
+
+
+def test_only_the_question_owner_verifies(client, register):
+    owner, _ = register("client")
+    expert, _ = register("expert")
+    question_id = _ask(client, owner)
+    answer_id = _answer(client, question_id, expert)
+
+    assert _verify(client, question_id, answer_id, expert).status_code == 403
+    assert _verify(client, question_id, "missing", owner).status_code == 404
+    assert _verify(client, "missing", answer_id, owner).status_code == 404
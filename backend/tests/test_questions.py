@@ -0,0 +1,87 @@
+from .conftest import API
+
+
+def _ask(client, headers):
+    response = client.post(
+        f"{API}/questions/",
+        json={"title": "Etag", "description": "d", "category": "DevOps", "status": "published"},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def test_question_etag_follows_embedded_profiles(client, register):
+    client_headers, _ = register("client")
+    expert_headers, _ = register("expert")
+    client.put(f"{API}/users/me/profile", json={"bio": "before"}, headers=client_headers)
+    question_id = _ask(client, client_headers)
+    response = client.post(
+        f"{API}/questions/{question_id}/answers", json={"answerText": "a"}, headers=expert_headers
+    )
+    assert response.status_code == 201, response.text
+
+    etag = client.get(f"{API}/questions/{question_id}/answers").headers["ETag"]
+    revalidated = client.get(
+        f"{API}/questions/{question_id}/answers", headers={"If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+
+    # The author's profile is embedded in every answer.
+    client.put(f"{API}/users/me/profile", json={"bio": "after"}, headers=expert_headers)
+    answers = client.get(
+        f"{API}/questions/{question_id}/answers", headers={"If-None-Match": etag}
+    )
+    assert answers.status_code == 200
+    assert answers.json()[0]["authorProfile"]["bio"] == "after"
+
+    # So is the client's, in the question itself.
+    etag = client.get(f"{API}/questions/{question_id}").headers["ETag"]
+    client.put(f"{API}/users/me/profile", json={"bio": "after"}, headers=client_headers)
+    question = client.get(f"{API}/questions/{question_id}", headers={"If-None-Match": etag})
+    assert question.status_code == 200
+    assert question.json()["clientProfile"]["bio"] == "after"
+
+
+def test_answer_page_headers_are_exposed_to_browsers(client):
+    response = client.get(
+        f"{API}/questions/missing/answers", headers={"Origin": "http://localhost:5173"}
+    )
+    exposed = response.headers["Access-Control-Expose-Headers"]
+    assert {"X-Next-Cursor", "ETag"} <= {name.strip() for name in exposed.split(",")}
+
+
+def test_answer_pages_follow_the_cursor_past_the_accepted_answer(client, register):
+    client_headers, _ = register("client")
+    expert_headers, _ = register("expert")
+    question_id = _ask(client, client_headers)
+    answer_ids = []
+    for n in range(4):
+        response = client.post(
+            f"{API}/questions/{question_id}/answers",
+            json={"answerText": f"answer {n}"},
+            headers=expert_headers,
+        )
+        assert response.status_code == 201, response.text
+        answer_ids.append(response.json()["id"])
+    response = client.post(
+        f"{API}/questions/{question_id}/answers/{answer_ids[2]}/verify",
+        json={"isCorrect": True},
+        headers=client_headers,
+    )
+    assert response.status_code == 200, response.text
+
+    paged, cursor = [], None
+    while True:
+        params = {"limit": 1, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"{API}/questions/{question_id}/answers", params=params)
+        assert response.status_code == 200, response.text
+        paged += [answer["id"] for answer in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    everything = client.get(f"{API}/questions/{question_id}/answers").json()
+    assert paged == [answer["id"] for answer in everything]
+    assert paged[0] == answer_ids[2]
+    assert sorted(paged) == sorted(answer_ids)
@@ -0,0 +1,63 @@
+import time
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app import database
+from app.core.read_routing import PRIMARY_UNTIL_HEADER, PrimaryStickiness, ReadYourWritesMiddleware
+
+
+def _scope(until=None):
+    headers = [] if until is None else [(PRIMARY_UNTIL_HEADER.lower().encode(), str(until).encode())]
+    return {"type": "http", "method": "GET", "path": "/", "headers": headers}
+
+
+def test_writes_hand_out_a_primary_marker():
+    app = FastAPI()
+
+    @app.post("/ok")
+    def ok():
+        return {}
+
+    @app.post("/fail")
+    def fail():
+        raise HTTPException(status_code=400)
+
+    @app.get("/read")
+    def read():
+        return {}
+
+    app.add_middleware(ReadYourWritesMiddleware, stickiness=PrimaryStickiness(5))
+    client = TestClient(app)
+
+    marker = client.post("/ok").headers[PRIMARY_UNTIL_HEADER]
+    assert 4 < float(marker) - time.time() <= 5
+    assert PRIMARY_UNTIL_HEADER not in client.post("/fail").headers
+    assert PRIMARY_UNTIL_HEADER not in client.get("/read").headers
+
+
+def test_only_live_markers_are_sticky():
+    stickiness = PrimaryStickiness(5)
+    now = time.time()
+    assert stickiness.is_sticky(_scope(stickiness.marker()))
+    assert not stickiness.is_sticky(_scope())
+    assert not stickiness.is_sticky(_scope(now - 1))
+    # Further ahead than one window, or not a time at all: never issued here.
+    assert not stickiness.is_sticky(_scope(now + 60))
+    assert not stickiness.is_sticky(_scope("inf"))
+    assert not stickiness.is_sticky(_scope("soon"))
+
+
+def test_reads_go_to_a_replica_unless_the_caller_wrote(monkeypatch):
+    replica = object()
+    monkeypatch.setattr(database, "ReplicaSessions", [replica])
+    monkeypatch.setattr(database, "stickiness", PrimaryStickiness(5))
+
+    anonymous = Request(_scope())
+    assert database.read_session_factory(anonymous) is replica
+    assert database.served_by_replica(anonymous)
+
+    writer = Request(_scope(database.stickiness.marker()))
+    assert database.read_session_factory(writer) is database.SessionLocal
+    assert not database.served_by_replica(writer)
@@ -0,0 +1,70 @@
+import os
+
+from .conftest import API
+
+
+def _word():
+    # Scopes each test's search to its own questions in the shared database.
+    return f"w{os.urandom(5).hex()}"
+
+
+def _ask(client, headers, title, description="d"):
+    response = client.post(
+        f"{API}/questions/",
+        json={"title": title, "description": description, "category": "DevOps", "status": "published"},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _search(client, **params):
+    response = client.get(f"{API}/questions/search", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_highlights_escape_question_text(client, register):
+    headers, _ = register("client")
+    word = _word()
+    in_title = _ask(client, headers, f"<img src=x onerror=alert(1)> {word}")
+    in_description = _ask(client, headers, "Plain", f"<b>{word}</b> \x02 tail")
+
+    hits = {hit["question"]["id"]: hit for hit in _search(client, q=word)["items"]}
+    title = hits[in_title]["titleHighlight"]
+    assert title == f"&lt;img src=x onerror=alert(1)&gt; <mark>{word}</mark>"
+    snippet = hits[in_description]["snippet"]
+    assert f"&lt;b&gt;<mark>{word}</mark>&lt;/b&gt;" in snippet
+    assert "\x02" not in snippet
+
+
+def test_title_matches_rank_above_description_matches(client, register):
+    headers, _ = register("client")
+    word = _word()
+    in_description = _ask(client, headers, "Unrelated", f"mentions {word} once")
+    in_title = _ask(client, headers, f"About {word}")
+
+    ids = [hit["question"]["id"] for hit in _search(client, q=word)["items"]]
+    assert ids == [in_title, in_description]
+
+
+def test_cursor_pages_through_every_hit_once(client, register):
+    headers, _ = register("client")
+    word = _word()
+    asked = {_ask(client, headers, f"{word} {n}", f"{word} " * n) for n in range(1, 6)}
+    # Two questions with identical text tie on rank and fall back to id order.
+    asked.add(_ask(client, headers, f"{word} 1", word))
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": word, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = _search(client, **params)
+        seen += [hit["question"]["id"] for hit in page["items"]]
+        cursor = page["nextCursor"]
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(asked)
+    assert len(seen) == len(asked)
+    assert seen == [hit["question"]["id"] for hit in _search(client, q=word, limit=50)["items"]]
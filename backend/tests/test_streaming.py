@@ -0,0 +1,73 @@
+import json
+import os
+
+from pydantic import BaseModel
+
+from app.core import streaming
+
+from .conftest import API
+
+
+class Item(BaseModel):
+    n: int
+
+
+def _ask_three(client, headers):
+    category = f"Stream-{os.urandom(3).hex()}"
+    for n in range(3):
+        response = client.post(
+            f"{API}/questions/",
+            json={"title": f"q{n}", "description": "d", "category": category, "status": "published"},
+            headers=headers,
+        )
+        assert response.status_code == 201, response.text
+    return category
+
+
+def test_streamed_question_pages_match_the_buffered_ones(client, register):
+    headers, _ = register("client")
+    category = _ask_three(client, headers)
+    params = {"category": category, "limit": 2}
+
+    buffered = client.get(f"{API}/questions/", params=params).json()
+    streamed = client.get(f"{API}/questions/", params={**params, "stream": "true"})
+    assert streamed.headers["content-type"] == "application/json"
+    assert streamed.json() == buffered
+    assert buffered["total"] == 3 and len(buffered["items"]) == 2 and buffered["nextCursor"]
+
+    ndjson = client.get(
+        f"{API}/questions/", params=params, headers={"Accept": streaming.NDJSON_MEDIA_TYPE}
+    )
+    assert ndjson.headers["content-type"] == streaming.NDJSON_MEDIA_TYPE
+    assert [json.loads(line) for line in ndjson.text.splitlines()] == buffered["items"]
+
+    # The streamed cursor continues where the page stopped.
+    rest = client.get(
+        f"{API}/questions/",
+        params={"category": category, "cursor": buffered["nextCursor"], "stream": "true"},
+    ).json()
+    assert [item["title"] for item in rest["items"]] == ["q0"]
+    assert rest["nextCursor"] is None
+
+
+def test_streamed_experts_match_the_buffered_list(client, register):
+    register("expert")
+    buffered = client.get(f"{API}/users/experts", params={"limit": 50}).json()
+    streamed = client.get(f"{API}/users/experts", params={"limit": 50, "stream": "true"})
+    assert streamed.json() == buffered
+
+
+def test_bodies_are_flushed_in_chunks(monkeypatch):
+    monkeypatch.setattr(streaming, "CHUNK_BYTES", 16)
+    items = [Item(n=n) for n in range(10)]
+    body = streaming._Body("json", b'{"items":[', lambda: b'],"done":true}')
+    chunks = list(streaming._sync_chunks(items, body))
+    assert len(chunks) > 2
+    assert json.loads(b"".join(chunks)) == {"items": [{"n": n} for n in range(10)], "done": True}
+
+    ndjson = streaming._Body("ndjson", b"ignored", lambda: b"ignored")
+    lines = b"".join(streaming._sync_chunks(items, ndjson)).splitlines()
+    assert [json.loads(line) for line in lines] == [{"n": n} for n in range(10)]
+
+    empty = streaming._Body("json", b"[", lambda: b"]")
+    assert json.loads(b"".join(streaming._sync_chunks([], empty))) == []
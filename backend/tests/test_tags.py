@@ -0,0 +1,76 @@
+import os
+
+from sqlalchemy import select
+
+from app.counters import reconcile_all
+from app.database import SessionLocal, engine
+from app.models import CategoryTag, Tag
+
+from .conftest import API
+
+
+def _tag():
+    return f"t{os.urandom(4).hex()}"
+
+
+def _ask(client, headers, category, tags):
+    response = client.post(
+        f"{API}/questions/",
+        json={"title": "Tags", "description": "d", "category": category, "tags": tags, "status": "published"},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _counts(*names):
+    with SessionLocal() as db:
+        tags = dict(db.execute(select(Tag.name, Tag.questions_count).where(Tag.name.in_(names))).all())
+        per_category = {
+            (category, tag): count
+            for category, tag, count in db.execute(
+                select(CategoryTag.category, CategoryTag.tag, CategoryTag.questions_count).where(
+                    CategoryTag.tag.in_(names)
+                )
+            )
+        }
+    return {name: tags.get(name, 0) for name in names}, per_category
+
+
+def test_tag_counts_follow_question_writes(client, register):
+    headers, _ = register("client")
+    shared, other = _tag(), _tag()
+    first = _ask(client, headers, "DevOps", [shared.upper(), f" {shared} "])
+    _ask(client, headers, "Data", [shared, other])
+
+    tags, per_category = _counts(shared, other)
+    assert tags == {shared: 2, other: 1}
+    assert per_category == {("DevOps", shared): 1, ("Data", shared): 1, ("Data", other): 1}
+
+    response = client.put(
+        f"{API}/questions/{first}", json={"tags": [other], "category": "Data"}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    tags, per_category = _counts(shared, other)
+    assert tags == {shared: 1, other: 2}
+    assert {key: n for key, n in per_category.items() if n} == {("Data", shared): 1, ("Data", other): 2}
+
+    assert client.delete(f"{API}/questions/{first}", headers=headers).status_code == 204
+    assert _counts(shared, other)[0] == {shared: 1, other: 1}
+
+    listed = client.get(f"{API}/tags", params={"prefix": other, "category": "Data"}).json()
+    assert listed == [{"name": other, "questionsCount": 1}]
+
+
+def test_reconciliation_rebuilds_tag_counts(client, register):
+    headers, _ = register("client")
+    tag = _tag()
+    _ask(client, headers, "DevOps", [tag])
+    with SessionLocal() as db:
+        db.merge(Tag(name=tag, questions_count=9))
+        db.merge(CategoryTag(category="DevOps", tag=tag, questions_count=0))
+        db.commit()
+
+    reconcile_all(engine)
+
+    assert _counts(tag) == ({tag: 1}, {("DevOps", tag): 1})
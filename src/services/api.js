@@ -6,6 +6,10 @@ const DEFAULT_BASE_URL = import.meta.env.DEV
     ? 'http://localhost:8000/api/v1'
     : 'https://skillgig-production.up.railway.app/api/v1'
 const AUTH_STORAGE_KEY = 'skillgig_auth'
+// Writes answer with this header; sending it back keeps our reads on the
+// primary database until our own changes have reached the replicas.
+const PRIMARY_UNTIL_HEADER = 'X-Primary-Until'
+let primaryUntil = null
 const normalizeTokenType = (type) => {
     if (!type) {
         return null
@@ -103,7 +107,7 @@ const getStoredAuthHeader = () => {
     }
 }
 
-const request = async (path, options = {}) => {
+const send = async (path, options = {}) => {
     const url = buildUrl(path)
     const { headers, body, ...rest } = options
     const shouldSerializeBody = isSerializableObject(body)
@@ -125,6 +129,10 @@ const request = async (path, options = {}) => {
         mergedHeaders.Authorization = authHeader
     }
 
+    if (primaryUntil && Number(primaryUntil) * 1000 > Date.now()) {
+        mergedHeaders[PRIMARY_UNTIL_HEADER] = primaryUntil
+    }
+
     const init = {
         headers: mergedHeaders,
         body: shouldSerializeBody ? JSON.stringify(body) : body,
@@ -132,6 +140,7 @@ const request = async (path, options = {}) => {
     }
 
     const response = await fetch(url, init)
+    primaryUntil = response.headers.get(PRIMARY_UNTIL_HEADER) || primaryUntil
     const payload = await parseResponse(response)
 
     if (!response.ok) {
@@ -146,12 +155,19 @@ const request = async (path, options = {}) => {
         throw error
     }
 
-    return payload
+    return { payload, headers: response.headers }
 }
 
+const request = async (path, options) => (await send(path, options)).payload
+
 export const apiGet = (path, options) =>
     request(path, { method: 'GET', ...options })
 
+// Like apiGet, but resolves to { payload, headers } for endpoints that page
+// through response headers (e.g. X-Next-Cursor).
+export const apiGetWithHeaders = (path, options) =>
+    send(path, { method: 'GET', ...options })
+
 export const apiPost = (path, body, options) =>
     request(path, { method: 'POST', body, ...options })
 
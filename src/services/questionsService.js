@@ -1,4 +1,4 @@
-import { apiGet, apiPost, apiPut, apiDelete } from './api'
+import { apiGet, apiGetWithHeaders, apiPost, apiPut, apiDelete, apiBaseUrl } from './api'
 
 const DEFAULT_LIST_LIMIT = 20
 
@@ -214,6 +214,7 @@ export const fetchRecentQuestions = async ({ limit = 5, status = 'published' } =
 export const fetchQuestions = async ({
   limit = DEFAULT_LIST_LIMIT,
   offset = 0,
+  cursor,
   category,
   difficulty,
   tags,
@@ -221,7 +222,8 @@ export const fetchQuestions = async ({
 } = {}) => {
   const query = buildQuery({
     limit,
-    offset,
+    offset: cursor ? undefined : offset,
+    cursor,
     category,
     difficulty,
     status_filter: status,
@@ -233,7 +235,8 @@ export const fetchQuestions = async ({
   const items = Array.isArray(data?.items) ? data.items : Array.isArray(data) ? data : []
 
   return {
-    total: data?.total ?? items.length,
+    total: data?.total ?? null,
+    nextCursor: data?.nextCursor ?? data?.next_cursor ?? null,
     items: items.map(normalizeQuestion).filter(Boolean)
   }
 }
@@ -270,15 +273,22 @@ export const deleteQuestion = async (questionId) => {
   return apiDelete(`/questions/${questionId}`)
 }
 
-export const fetchQuestionAnswers = async (questionId) => {
+// One page of answers; pass `nextCursor` back in to get the following page.
+export const fetchQuestionAnswers = async (questionId, cursor = null) => {
   if (!questionId) {
     throw new Error('Question ID қажет')
   }
-  const data = await apiGet(`/questions/${questionId}/answers`)
-  if (!Array.isArray(data)) {
-    return []
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : ''
+  const { payload, headers } = await apiGetWithHeaders(
+    `/questions/${questionId}/answers${query}`
+  )
+  if (!Array.isArray(payload)) {
+    return { answers: [], nextCursor: null }
+  }
+  return {
+    answers: payload.map(normalizeAnswer).filter(Boolean),
+    nextCursor: headers.get('X-Next-Cursor')
   }
-  return data.map(normalizeAnswer).filter(Boolean)
 }
 
 export const createAnswer = async (questionId, payload) => {
@@ -328,6 +338,37 @@ export const verifyAnswer = async (questionId, answerId, isCorrect) => {
   return normalizeAnswer(response)
 }
 
+// Live answer events of one question over server-sent events. `onEvent`
+// gets `{ type, ... }` with a normalized `answer` when present, and
+// `{ type: 'resync' }` after a reconnect, when events may have been missed.
+// Returns a function that closes the stream.
+export const subscribeToQuestionEvents = (questionId, onEvent) => {
+  if (!questionId || typeof EventSource === 'undefined') {
+    return () => {}
+  }
+  const source = new EventSource(`${apiBaseUrl}/questions/${questionId}/events`)
+  let connected = false
+  source.onopen = () => {
+    if (connected) {
+      onEvent({ type: 'resync' })
+    }
+    connected = true
+  }
+  source.onmessage = (message) => {
+    let event
+    try {
+      event = JSON.parse(message.data)
+    } catch {
+      return
+    }
+    if (event.answer) {
+      event.answer = normalizeAnswer(event.answer)
+    }
+    onEvent(event)
+  }
+  return () => source.close()
+}
+
 export const fetchMyQuestions = async () => {
   const data = await apiGet('/users/me/questions')
   if (!Array.isArray(data)) {